@@ -0,0 +1,311 @@
+"""
+Воспроизводимые замеры производительности машины Тьюринга.
+
+Покрывает три слоя приложения:
+  - движок: TuringMachine.run (сгенерированный код и интерпретатор), рост ленты Tape,
+    поиск в TransitionTable.get;
+  - хранилище: save_result / get_history на временной базе SQLite;
+  - HTTP: задержка POST /check через ASGI-клиент в том же процессе.
+
+Запуск:
+    python -m benchmarks.bench --output bench.json
+    python -m benchmarks.bench --output new.json --compare bench.json --threshold 0.2
+
+При --compare программа завершается с кодом 1, если хотя бы один замер
+стал медленнее базового больше чем на threshold (доля, 0.2 = 20%).
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from tm import database
+from tm.tape import Tape
+from tm.transitions import TransitionTable
+from tm.turing_machine import TuringMachine
+
+
+SEED = 12345
+CYRILLIC = "абвгдеёжзийклмнопрстуфхцчшщъыьэюя"
+LATIN = "abcdefghijklmnopqrstuvwxyz"
+
+
+def measure(func, repeat: int = 5, number: int = 1) -> dict:
+    """
+    Выполняет func() number раз в каждом из repeat повторов.
+    Возвращает время одного вызова в секундах (минимум и медиана по повторам).
+    """
+    func()  # прогрев
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "repeat": repeat,
+        "number": number,
+    }
+
+
+def make_palindrome(length: int, alphabet: str, rng: random.Random) -> str:
+    half = "".join(rng.choice(alphabet) for _ in range(length // 2))
+    middle = rng.choice(alphabet) if length % 2 else ""
+    return half + middle + half[::-1]
+
+
+# --- Движок ---
+
+def bench_machine_run(results: dict, quick: bool):
+    rng = random.Random(SEED)
+    table = TransitionTable.strict_palindrome_table()
+    lengths = [8, 32, 128] if quick else [8, 32, 128, 256]
+    for alphabet_name, alphabet in (("latin", LATIN), ("cyrillic", CYRILLIC), ("binary", "ab")):
+        for length in lengths:
+            word = make_palindrome(length, alphabet, rng)
+
+            def run(use_codegen=True):
+                machine = TuringMachine(table)
+                machine.use_codegen = use_codegen
+                machine.load_tape(word)
+                machine.run()
+
+            machine = TuringMachine(table)
+            machine.load_tape(word)
+            machine.run()
+            steps = machine.step_count
+
+            # run() выполняет сгенерированный код (tm/codegen.py); для латиницы
+            # отдельно замеряется интерпретатор, чтобы видеть разницу
+            variants = [("run", True)] + ([("run_interpreted", False)] if alphabet_name == "latin" else [])
+            for name, use_codegen in variants:
+                stats = measure(lambda: run(use_codegen), repeat=3 if quick else 5)
+                stats["steps"] = steps
+                stats["steps_per_sec"] = steps / stats["min"] if stats["min"] else 0.0
+                results[f"engine.{name}.{alphabet_name}.{length}"] = stats
+
+
+def bench_tape_growth(results: dict, quick: bool):
+    size = 10_000 if quick else 100_000
+
+    def grow_right():
+        tape = Tape("a")
+        for pos in range(size):
+            tape.write(pos, "b")
+
+    def sparse_jump():
+        tape = Tape("a")
+        tape.write(size, "b")
+
+    def ensure_step():
+        tape = Tape("a")
+        for pos in range(size):
+            tape.ensure_index(pos)
+
+    results[f"tape.grow_right.{size}"] = measure(grow_right, repeat=3)
+    results[f"tape.sparse_jump.{size}"] = measure(sparse_jump, repeat=3)
+    results[f"tape.ensure_index.{size}"] = measure(ensure_step, repeat=3)
+
+
+def bench_transition_lookup(results: dict, quick: bool):
+    table = TransitionTable.strict_palindrome_table()
+    rng = random.Random(SEED)
+    states = list(table.transitions)
+    symbols = list(CYRILLIC + LATIN + "X⊔")
+    queries = [(rng.choice(states), rng.choice(symbols)) for _ in range(1000)]
+
+    def lookup():
+        get = table.get
+        for state, symbol in queries:
+            get(state, symbol)
+
+    stats = measure(lookup, repeat=5, number=3 if quick else 10)
+    stats["per_lookup"] = stats["min"] / len(queries)
+    results["transitions.get.1000"] = stats
+
+
+def bench_batch_run(results: dict, quick: bool):
+    try:
+        from tm.batch import BatchTuringMachine
+    except ImportError as e:
+        print(f"Пакетные замеры пропущены: {e}", file=sys.stderr)
+        return
+
+    rng = random.Random(SEED)
+    table = TransitionTable.strict_palindrome_table()
+    count = 200 if quick else 2000
+    words = [make_palindrome(rng.randint(4, 32), LATIN, rng) for _ in range(count)]
+    batch = BatchTuringMachine(table)
+
+    stats = measure(lambda: batch.run(words), repeat=3)
+    stats["words_per_sec"] = count / stats["min"] if stats["min"] else 0.0
+    results[f"engine.batch.{count}"] = stats
+
+
+# --- Хранилище ---
+
+def bench_database(results: dict, quick: bool):
+    rows = 200 if quick else 1000
+    original_path = database.DB_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = os.path.join(tmp, "bench.db")
+        try:
+            database.init_db()
+
+            def save_many():
+                for i in range(rows):
+                    database.save_result(f"слово{i}", i % 2 == 0, i)
+
+            def read_history():
+                database.get_history(20)
+
+            stats = measure(save_many, repeat=3)
+            stats["rows_per_sec"] = rows / stats["min"] if stats["min"] else 0.0
+            results[f"db.save_result.{rows}"] = stats
+            results["db.get_history.20"] = measure(read_history, repeat=5, number=20)
+        finally:
+            database.DB_PATH = original_path
+
+
+# --- HTTP ---
+
+def bench_http_check(results: dict, quick: bool):
+    try:
+        import httpx
+        from web import app_web
+        from web.cache import ResultCache
+    except ImportError as e:
+        print(f"HTTP-замеры пропущены: {e}", file=sys.stderr)
+        return
+
+    words = {"short": "шалаш", "long": "а" * 20 + "б" + "а" * 20}
+    number = 5 if quick else 20
+
+    async def session(cache):
+        transport = httpx.ASGITransport(app=app_web.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, word in words.items():
+                async def one():
+                    response = await client.post("/check", json={"word": word})
+                    response.raise_for_status()
+
+                await one()  # прогрев
+                # http.check.* — симуляция на каждый запрос (кэш очищается перед замером),
+                # http.check_cached.* — ответ из общего кэша результатов
+                for key, cached in (("check", False), ("check_cached", True)):
+                    samples = []
+                    for _ in range(number):
+                        if not cached:
+                            cache.clear()
+                        start = time.perf_counter()
+                        await one()
+                        samples.append(time.perf_counter() - start)
+                    results[f"http.{key}.{name}"] = {
+                        "min": min(samples),
+                        "median": statistics.median(samples),
+                        "repeat": number,
+                        "number": 1,
+                    }
+
+    original_path = database.DB_PATH
+    original_cache = app_web.result_cache
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = os.path.join(tmp, "bench_http.db")
+        app_web.result_cache = ResultCache(os.path.join(tmp, "bench_http_cache.db"))
+        try:
+            database.init_db()
+            asyncio.run(session(app_web.result_cache))
+        finally:
+            database.DB_PATH = original_path
+            app_web.result_cache = original_cache
+
+
+BENCHMARKS = {
+    "engine": bench_machine_run,
+    "batch": bench_batch_run,
+    "tape": bench_tape_growth,
+    "transitions": bench_transition_lookup,
+    "db": bench_database,
+    "http": bench_http_check,
+}
+
+
+def run_benchmarks(only=None, quick: bool = False) -> dict:
+    """Запускает выбранные группы замеров и возвращает отчёт."""
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        bench(results, quick)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.2) -> list:
+    """
+    Сравнивает два отчёта по полю "min".
+    Возвращает список регрессий (name, было, стало, относительное изменение)
+    для замеров, ставших медленнее больше чем на threshold.
+    """
+    regressions = []
+    base_results = baseline.get("results", {})
+    for name, stats in current.get("results", {}).items():
+        base = base_results.get(name)
+        if not base or not base.get("min"):
+            continue
+        change = stats["min"] / base["min"] - 1.0
+        if change > threshold:
+            regressions.append((name, base["min"], stats["min"], change))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Замеры производительности машины Тьюринга")
+    parser.add_argument("--output", "-o", help="файл для JSON-отчёта")
+    parser.add_argument("--compare", help="базовый JSON-отчёт для сравнения")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="допустимое замедление (доля, по умолчанию 0.2)")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS),
+                        help="запустить только указанные группы")
+    parser.add_argument("--quick", action="store_true", help="уменьшенные размеры входных данных")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.only, args.quick)
+
+    for name, stats in report["results"].items():
+        print(f"{name:40s} {stats['min'] * 1000:10.3f} мс")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        for name, before, after, change in regressions:
+            print(f"РЕГРЕССИЯ {name}: {before * 1000:.3f} мс → {after * 1000:.3f} мс (+{change:.0%})")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Нагрузочный тест веб-сервера с разным числом воркеров uvicorn.
+
+Для каждого значения --workers запускается отдельный сервер на временной
+базе истории и кэше, затем в течение --duration секунд --concurrency
+одновременных клиентов отправляют POST /check со случайными словами.
+Печатается пропускная способность (запросов в секунду) и задержки.
+
+Запуск:
+    python -m benchmarks.load_test --workers 1 2 4 --duration 10
+    python -m benchmarks.load_test --workers 1 4 --repeat 0.5 --output load.json
+
+--repeat — доля запросов со словами из небольшого общего набора: такие
+запросы после первого раза отдаются из общего кэша любым воркером.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from benchmarks.bench import LATIN, make_palindrome
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers: int, port: int, tmp: str) -> subprocess.Popen:
+    env = dict(os.environ, TM_DB_PATH=os.path.join(tmp, "load.db"), TM_CACHE_PATH=os.path.join(tmp, "load_cache.db"))
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "web.app_web:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        cwd=ROOT, env=env,
+    )
+
+
+async def wait_ready(client, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if (await client.get("/history")).status_code == 200:
+                return
+        except Exception:
+            if time.monotonic() > deadline:
+                raise RuntimeError("Сервер не запустился")
+        await asyncio.sleep(0.1)
+
+
+async def generate_load(client, duration: float, concurrency: int, repeat: float, seed: int) -> dict:
+    rng = random.Random(seed)
+    shared = [make_palindrome(rng.randint(10, 30), LATIN, rng) for _ in range(20)]
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + duration
+
+    async def user(n: int):
+        nonlocal errors
+        local = random.Random(seed + n)
+        while time.monotonic() < deadline:
+            if local.random() < repeat:
+                word = local.choice(shared)
+            else:
+                word = make_palindrome(local.randint(10, 30), LATIN, local)
+            start = time.perf_counter()
+            try:
+                response = await client.post("/check", json={"word": word})
+                ok = response.status_code == 200
+            except Exception:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user(n) for n in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": statistics.median(latencies) if latencies else None,
+        "p99": latencies[int(len(latencies) * 0.99)] if latencies else None,
+    }
+
+
+async def run_one(workers: int, duration: float, concurrency: int, repeat: float, seed: int) -> dict:
+    import httpx
+
+    port = free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        server = start_server(workers, port, tmp)
+        try:
+            limits = httpx.Limits(max_connections=concurrency)
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30) as client:
+                await wait_ready(client)
+                # прогрев: каждый воркер импортирует модули и строит таблицу
+                warmup = await generate_load(client, min(1.0, duration), concurrency, repeat, seed + 1)
+                result = await generate_load(client, duration, concurrency, repeat, seed)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+        # все воркеры пишут в одну базу: без потерянных записей строк столько же, сколько ответов
+        conn = sqlite3.connect(os.path.join(tmp, "load.db"))
+        result["history_rows"] = conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+        result["sent"] = warmup["requests"] + result["requests"]
+        conn.close()
+    result["workers"] = workers
+    return result
+
+
+def run_load_test(workers_list, duration: float = 5.0, concurrency: int = 32,
+                  repeat: float = 0.0, seed: int = 12345) -> list:
+    return [asyncio.run(run_one(w, duration, concurrency, repeat, seed)) for w in workers_list]
+
+
+def format_table(results: list) -> str:
+    base = results[0]["rps"] or 1.0
+    lines = [f"{'воркеры':>8} {'запр/с':>10} {'ускор.':>7} {'p50, мс':>9} {'p99, мс':>9} {'ошибки':>7} {'история':>12}"]
+    for r in results:
+        p50 = f"{r['p50'] * 1000:.1f}" if r["p50"] is not None else "-"
+        p99 = f"{r['p99'] * 1000:.1f}" if r["p99"] is not None else "-"
+        lines.append(f"{r['workers']:>8} {r['rps']:>10.1f} {r['rps'] / base:>6.2f}x {p50:>9} {p99:>9} {r['errors']:>7} {r['history_rows']:>5}/{r['sent']:<6}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Нагрузочный тест /check с разным числом воркеров")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--duration", type=float, default=5.0, help="секунд нагрузки на каждый запуск")
+    parser.add_argument("--concurrency", type=int, default=32, help="одновременных клиентов")
+    parser.add_argument("--repeat", type=float, default=0.0, help="доля запросов с повторяющимися словами")
+    parser.add_argument("--output", help="сохранить результаты в JSON")
+    args = parser.parse_args(argv)
+
+    results = run_load_test(args.workers, args.duration, args.concurrency, args.repeat)
+    print(format_table(results))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 1 if any(r["errors"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
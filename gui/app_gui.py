@@ -35,6 +35,8 @@ class DatabaseViewer(QDialog):
         super().__init__(parent)
         self.setWindowTitle("История проверок - База данных")
         self.setGeometry(200, 200, 800, 500)
+        # закрытое окно удаляется, а не остаётся скрытым дочерним виджетом главного окна
+        self.setAttribute(Qt.WA_DeleteOnClose)
         
         layout = QVBoxLayout()
         
@@ -67,29 +69,52 @@ class DatabaseViewer(QDialog):
         layout.addLayout(button_layout)
         
         self.setLayout(layout)
+
+        # Новые записи (в том числе из других окон и процессов) дописываются без перечитывания всей таблицы
+        self.last_id = 0
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.load_new_rows)
         self.load_data()
+        self.poll_timer.start(1000)
     
+    def done(self, result):
+        """Закрытие окна: опрос базы больше не нужен"""
+        self.poll_timer.stop()
+        super().done(result)
+
     def load_data(self):
         """Загрузка данных из базы"""
+        self.table.setRowCount(0)
+        self.last_id = 0
+        self.load_new_rows()
+
+    def load_new_rows(self):
+        """Добавляет в начало таблицы только записи с id больше последнего показанного"""
         try:
             conn = sqlite3.connect(DB_PATH)
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT id, word, result, steps, created_at 
                 FROM history 
-                ORDER BY created_at DESC
-            """)
+                WHERE id > ?
+                ORDER BY id DESC
+            """, (self.last_id,))
             data = cursor.fetchall()
             conn.close()
-            
-            self.table.setRowCount(len(data))
-            for row_idx, row_data in enumerate(data):
-                for col_idx, cell_data in enumerate(row_data):
-                    item = QTableWidgetItem(str(cell_data))
-                    self.table.setItem(row_idx, col_idx, item)
-                    
         except Exception as e:
+            self.poll_timer.stop()
             QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить данные: {e}")
+            return
+
+        if not data:
+            return
+        self.last_id = data[0][0]
+        # новые строки вставляются одним блоком в начало таблицы
+        self.table.model().insertRows(0, len(data))
+        for row_idx, row_data in enumerate(data):
+            for col_idx, cell_data in enumerate(row_data):
+                item = QTableWidgetItem(str(cell_data))
+                self.table.setItem(row_idx, col_idx, item)
 
 
 class CompactTuringAppGUI(QWidget):
@@ -444,4 +469,3 @@ class CompactTuringAppGUI(QWidget):
 
 # Совместимость
 TuringAppGUI = CompactTuringAppGUI
-init_db()
@@ -1,18 +1,19 @@
 import sys
-import sqlite3
-from PySide6.QtWidgets import QApplication
 from tm.turing_machine import TuringMachine
-from tm.transitions import TransitionTable
-from gui.app_gui import TuringAppGUI, init_db
+from tm.transitions import get_table
 
 
 def main():
     """Точка входа в GUI-приложение 'Машина Тьюринга — Палиндром'."""
+    # Qt и модуль GUI тяжёлые — импортируем их только при запуске окна
+    from PySide6.QtWidgets import QApplication
+    from gui.app_gui import TuringAppGUI, init_db
+
     # 1. Инициализируем базу данных (создаётся таблица history, если её нет)
     init_db()
 
     # 2. Создаём таблицу переходов и саму машину Тьюринга
-    transitions = TransitionTable.strict_palindrome_table()
+    transitions = get_table("palindrome")
     machine = TuringMachine(
         transitions,
         start_state="q0",
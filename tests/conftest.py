@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def codegen_cache_dir(tmp_path_factory):
+    """Сгенерированные модули (tm/codegen.py) пишутся во временный каталог, а не в ~/.cache."""
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv("TM_CODEGEN_DIR", str(tmp_path_factory.mktemp("codegen")))
+        yield
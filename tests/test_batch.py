@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from tm.batch import BatchTuringMachine
+from tm.turing_machine import TuringMachine, TransitionTable
+
+
+def sequential(table, words, max_steps=100_000):
+    results = []
+    for word in words:
+        m = TuringMachine(table)
+        m.max_steps = max_steps
+        m.load_tape(word)
+        results.append((m.run(), m.step_count))
+    return results
+
+
+def test_batch_matches_sequential_palindromes():
+    rng = random.Random(7)
+    words = ["", "a", "aba", "abba", "abc", "шалаш", "казак", "X", "1a1"]
+    for _ in range(40):
+        half = "".join(rng.choice("abв") for _ in range(rng.randint(0, 6)))
+        words.append(half + half[::-1])
+        words.append(half + rng.choice("abв") + half[::-1][1:])
+    table = TransitionTable.strict_palindrome_table()
+
+    accepted, steps = BatchTuringMachine(table).run(words)
+
+    expected = sequential(table, words)
+    assert accepted.tolist() == [a for a, _ in expected]
+    assert steps.tolist() == [s for _, s in expected]
+
+
+def test_batch_respects_max_steps_and_left_growth():
+    table = TransitionTable({
+        "q0": {"_any_": ("_any_", "L", "q0")}  # бесконечно уходит влево
+    })
+    words = ["a", "abc"]
+    accepted, steps = BatchTuringMachine(table, max_steps=50).run(words)
+    assert not accepted.any()
+    assert steps.tolist() == [s for _, s in sequential(table, words, max_steps=50)]
+
+
+def test_batch_right_growth_after_left_growth():
+    # одна строка уходит влево (лента расширяется слева), другая — вправо за край ленты
+    table = TransitionTable({
+        "q0": {"a": ("a", "S", "w1"), "b": ("b", "R", "r")},
+        "w1": {"_any_": ("_any_", "L", "w2")},
+        "w2": {"_any_": ("_any_", "S", "w2")},
+        "r": {"_any_": ("_any_", "R", "r")},
+    })
+    words = ["a", "b"]
+    accepted, steps = BatchTuringMachine(table, max_steps=100).run(words)
+    assert not accepted.any()
+    assert steps.tolist() == [s for _, s in sequential(table, words, max_steps=100)]
+
+def test_batch_empty_input():
+    accepted, steps = BatchTuringMachine(TransitionTable.strict_palindrome_table()).run([])
+    assert accepted.size == 0 and steps.size == 0
+
+
+def test_batch_register_table_unicode():
+    table = TransitionTable.palindrome_table()
+    words = ["🙂a🙂", "12321", "1232", "", "ÉtÉ", "abcba", "abcab"]
+    accepted, steps = BatchTuringMachine(table).run(words)
+    expected = sequential(table, words)
+    assert accepted.tolist() == [a for a, _ in expected]
+    assert steps.tolist() == [s for _, s in expected]
@@ -0,0 +1,28 @@
+import pytest
+
+from benchmarks.bench import compare, run_benchmarks
+
+
+def test_compare_detects_regression():
+    baseline = {"results": {"a": {"min": 1.0}, "b": {"min": 1.0}}}
+    current = {"results": {"a": {"min": 1.5}, "b": {"min": 1.1}, "c": {"min": 9.0}}}
+    regressions = compare(baseline, current, threshold=0.2)
+    assert [r[0] for r in regressions] == ["a"]
+
+
+def test_quick_engine_report_structure():
+    report = run_benchmarks(only=["transitions"], quick=True)
+    stats = report["results"]["transitions.get.1000"]
+    assert stats["min"] > 0
+    assert "python" in report["meta"]
+
+
+def test_load_test_with_two_workers():
+    pytest.importorskip("uvicorn")
+    pytest.importorskip("httpx")
+    from benchmarks.load_test import run_load_test
+
+    results = run_load_test([2], duration=0.5, concurrency=4)
+    assert results[0]["requests"] > 0 and results[0]["errors"] == 0
+    # все воркеры пишут историю в одну базу без потерь
+    assert results[0]["history_rows"] == results[0]["sent"]
@@ -0,0 +1,99 @@
+import json
+import os
+import subprocess
+import sys
+
+from tm.cli import main
+
+
+def test_cli_words_from_args_jsonl(capsys):
+    assert main(["aba", "abc", "--jsonl"]) == 0
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r["word"], r["accepted"]) for r in lines] == [("aba", True), ("abc", False)]
+    assert lines[0]["steps"] > 0
+
+
+def test_cli_trace_and_max_steps(capsys):
+    main(["abba", "--jsonl", "--trace", "--max-steps", "3"])
+    result = json.loads(capsys.readouterr().out)
+    assert len(result["trace"]) == 3
+    assert result["accepted"] is False
+
+
+def test_cli_table_from_file_and_input_file(tmp_path, capsys):
+    table = tmp_path / "table.json"
+    table.write_text(json.dumps({
+        "transitions": {"s": {"a": ["a", "R", "s"], "⊔": ["⊔", "S", "yes"]}},
+        "start_state": "s", "accept_state": "yes", "reject_state": "no",
+    }), encoding="utf-8")
+    words = tmp_path / "words.txt"
+    words.write_text("aaa\n\nab\n", encoding="utf-8")
+
+    main(["--table", str(table), "--input", str(words), "--jsonl"])
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r["word"], r["accepted"], r["state"]) for r in lines] == [("aaa", True, "yes"), ("ab", False, "no")]
+
+
+def test_cli_workers_keep_order(capsys):
+    words = ["aba", "ab", "казак", "xyz", "a"] * 10
+    main(words + ["--jsonl", "--workers", "2"])
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r["word"] for r in lines] == words
+
+
+def test_cli_mmap(tmp_path, capsys):
+    path = tmp_path / "word.bin"
+    path.write_bytes("шалаш".encode("cp1251"))
+    main(["--mmap", str(path), "--encoding", "cp1251", "--jsonl"])
+    result = json.loads(capsys.readouterr().out)
+    assert result["accepted"] is True
+
+
+def test_cli_parallel_matches_mmap(tmp_path, capsys):
+    path = tmp_path / "word.bin"
+    path.write_bytes(b"abcde" * 20 + b"edcba" * 20)
+    main(["--mmap", str(path), "--jsonl"])
+    expected = json.loads(capsys.readouterr().out)
+    assert main(["--mmap", str(path), "--parallel", "--workers", "2", "--jsonl"]) == 0
+    result = json.loads(capsys.readouterr().out)
+    assert (result["accepted"], result["steps"]) == (True, expected["steps"])
+    assert main(["abba", "--parallel"]) == 2
+
+    # служебный символ X — последовательный прогон с тем же результатом, что без --parallel
+    path.write_bytes(b"aXbXa")
+    main(["--mmap", str(path), "--jsonl"])
+    expected = json.loads(capsys.readouterr().out)
+    assert main(["--mmap", str(path), "--parallel", "--jsonl"]) == 0
+    assert json.loads(capsys.readouterr().out) == expected
+
+
+def test_cli_optimize_reports_sizes(capsys):
+    main(["abba", "--optimize", "--jsonl"])
+    captured = capsys.readouterr()
+    assert json.loads(captured.out)["accepted"] is True
+    assert "Состояний:" in captured.err
+
+
+def test_cli_nondeterministic_table(capsys):
+    assert main(["--table", "repeated_symbol", "--search", "iddfs", "--jsonl", "abcb", "abc"]) == 0
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r["accepted"] for r in results] == [True, False]
+    assert all(r["complete"] for r in results)
+
+
+def test_cli_unknown_table():
+    assert main(["--table", "no_such_table", "aba"]) == 2
+
+
+def test_cli_stdin_without_heavy_imports():
+    code = (
+        "import sys, runpy; sys.argv = ['tm', '--jsonl']; "
+        "sys.stdin = __import__('io').StringIO('aba\\n');"
+        "\ntry:\n    runpy.run_module('tm', run_name='__main__')\nexcept SystemExit:\n    pass\n"
+        "print(sorted(m for m in ('PySide6', 'fastapi', 'sqlite3') if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+    first, last = out.strip().splitlines()
+    assert json.loads(first)["accepted"] is True
+    assert last == "[]"
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from web.coalesce import SingleFlight
+from web.trace import simulate
+
+
+def test_concurrent_calls_share_one_computation():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+        runs = []
+
+        async def compute():
+            runs.append(1)
+            await release.wait()
+            return {"value": 42}
+
+        waiters = [asyncio.ensure_future(flight.do("k", compute)) for _ in range(5)]
+        other = asyncio.ensure_future(flight.do("other", compute))
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters, other)
+        return flight, runs, results
+
+    flight, runs, results = asyncio.run(scenario())
+    assert len(runs) == 2
+    assert all(r is results[0] for r in results[:5])
+    assert flight.stats() == {"calls": 6, "executed": 2, "coalesced": 4, "inflight": 0}
+
+
+def test_errors_propagate_and_key_is_released():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def boom():
+            raise RuntimeError("fail")
+
+        async def ok():
+            return "ok"
+
+        with pytest.raises(RuntimeError):
+            await flight.do("k", boom)
+        return await flight.do("k", ok)
+
+    assert asyncio.run(scenario()) == "ok"
+
+
+def test_cancelled_waiter_does_not_cancel_others():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("k", compute))
+        second = asyncio.ensure_future(flight.do("k", compute))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+        return await second
+
+    assert asyncio.run(scenario()) == "done"
+
+
+def test_simulate_trace_shape():
+    payload = simulate("шалаш").to_dict()
+    assert payload["is_palindrome"] is True
+    first = payload["steps"][0]
+    assert first["tape"] == "шалаш"
+    assert set(first) == {"tape", "head", "state", "action"}
+    assert len(simulate("а" * 100).steps) == 500
+
+
+def test_coalesced_checks_each_write_history(tmp_path, monkeypatch):
+    httpx = pytest.importorskip("httpx")
+    pytest.importorskip("fastapi")
+    from tm import database
+    from web import app_web
+    from web.cache import ResultCache
+
+    monkeypatch.setattr(database, "DB_PATH", str(tmp_path / "coalesce.db"))
+    monkeypatch.setattr(app_web, "result_cache", ResultCache(str(tmp_path / "cache.db")))
+    database.init_db()
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app_web.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(client.post("/check", json={"word": "шалаш"}) for _ in range(10)))
+
+    responses = asyncio.run(scenario())
+    assert all(r.status_code == 200 for r in responses)
+    assert len(database.get_history(20)) == 10
@@ -0,0 +1,157 @@
+import ast
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+from tm import codegen
+from tm.optimize import minimize_table
+from tm.tape import MappedTape
+from tm.transitions import TransitionTable, get_table
+from tm.turing_machine import TuringMachine
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("TM_CODEGEN_DIR", str(tmp_path / "codegen"))
+    monkeypatch.setattr(codegen, "_loaded", {})
+    monkeypatch.setattr(codegen, "_by_table", codegen.weakref.WeakKeyDictionary())
+    return tmp_path / "codegen"
+
+
+def snapshot(machine, accepted):
+    tape = machine.tape
+    return accepted, machine.state, machine.step_count, machine.head, machine.register, tape.cells, tape.offset
+
+
+def run_both(table, word, max_steps=100_000, start_state="q0"):
+    results = []
+    for use_codegen in (False, True):
+        machine = TuringMachine(table, start_state=start_state)
+        machine.use_codegen = use_codegen
+        machine.max_steps = max_steps
+        machine.load_tape(word)
+        results.append(snapshot(machine, machine.run()))
+    return results
+
+
+@pytest.mark.parametrize("name", ["palindrome", "strict_palindrome"])
+def test_generated_code_matches_interpreter(name):
+    rng = random.Random(3)
+    table = get_table(name)
+    optimized, _ = minimize_table(table)
+    for _ in range(100):
+        word = "".join(rng.choice("абвabc") for _ in range(rng.randint(0, 9)))
+        for t in (table, optimized):
+            interpreted, compiled = run_both(t, word, max_steps=rng.choice([5, 40, 100_000]))
+            assert interpreted == compiled, word
+
+
+def test_left_extension_register_and_missing_transitions():
+    table = TransitionTable({
+        "q0": {"a": ("b", "L", "q1", "store"), "_any_": ("_any_", "R", "q0")},
+        "q1": {"⊔": ("c", "L", "q2"), "_reg_": ("_any_", "S", "q_accept")},
+        "q2": {"_reg_": ("_any_", "R", "q_accept")},
+        "q_accept": {}, "q_reject": {},
+    })
+    for word in ("a", "xa", "xya", "", "xyz"):
+        interpreted, compiled = run_both(table, word)
+        assert interpreted == compiled, word
+
+
+def test_source_uses_match_and_disk_cache(cache, monkeypatch):
+    table = TransitionTable.palindrome_table()
+    source = codegen.generate_source(table)
+    assert "match state:" in source and "def run(" in source
+
+    module = codegen.load_compiled(table)
+    files = os.listdir(cache)
+    assert files == [f"tm_generated_{codegen.table_hash(table)[:16]}.py"]
+
+    # новый процесс (пустой кэш в памяти) берёт модуль с диска, не генерируя его заново
+    monkeypatch.setattr(codegen, "_loaded", {})
+    monkeypatch.setattr(codegen, "_by_table", codegen.weakref.WeakKeyDictionary())
+    monkeypatch.setattr(codegen, "generate_source", lambda *a: pytest.fail("модуль сгенерирован повторно"))
+    again = codegen.load_compiled(TransitionTable.palindrome_table())
+    assert again is not module and again.STATES == module.STATES
+
+
+def test_unwritable_cache_falls_back_to_memory(tmp_path, monkeypatch):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    monkeypatch.setenv("TM_CODEGEN_DIR", str(blocker / "sub"))
+    with pytest.warns(UserWarning, match="недоступен"):
+        module = codegen.load_compiled(TransitionTable.palindrome_table())
+    assert module.STATE_IDS["q0"] == 2
+
+
+@pytest.mark.parametrize("name", ["palindrome", "strict_palindrome"])
+def test_if_chain_without_match(name, monkeypatch):
+    monkeypatch.setattr(codegen, "USE_MATCH", False)
+    table = get_table(name)
+    source = codegen.generate_source(table)
+    assert "match " not in source
+    ast.parse(source, feature_version=(3, 9))
+    rng = random.Random(5)
+    for _ in range(30):
+        word = "".join(rng.choice("абвabc") for _ in range(rng.randint(0, 9)))
+        interpreted, compiled = run_both(table, word)
+        assert interpreted == compiled, word
+
+
+def test_malformed_table_uses_interpreter():
+    table = TransitionTable({
+        "q0": {"a": ("a", "R", "q0"), "⊔": ("⊔", "S", "q_accept")},
+        "unused": {"x": ("x", "R")},  # недостижимое состояние с ошибкой
+    })
+    with pytest.raises(ValueError, match="Неверный переход"):
+        codegen.generate_source(table)
+    assert codegen.load_compiled(table) is None
+    machine = TuringMachine(table)
+    machine.load_tape("aa")
+    assert machine.run() and machine.step_count == 3
+
+    broken = TransitionTable({"q0": {"a": ("a", "R")}})
+    machine = TuringMachine(broken)
+    machine.load_tape("a")
+    with pytest.raises(ValueError, match="not enough values"):
+        machine.run()
+
+
+def test_cli_reports_malformed_table(tmp_path):
+    path = tmp_path / "bad.json"
+    path.write_text('{"transitions": {"q0": {"a": ["a", "R"]}}}', encoding="utf-8")
+    root = os.path.join(os.path.dirname(__file__), "..")
+    result = subprocess.run([sys.executable, "-m", "tm", "--table", str(path), "aaa"],
+                            cwd=root, capture_output=True, text=True, encoding="utf-8")
+    assert result.returncode == 2
+    assert "Ошибка: not enough values to unpack" in result.stderr
+
+
+def test_disk_cache_evicts_least_recently_used(cache, monkeypatch):
+    monkeypatch.setattr(codegen, "CACHE_MAX_FILES", 2)
+    tables = [TransitionTable({"q0": {"_any_": ("_any_", "S", f"q_{i}")}}) for i in range(4)]
+    for i, table in enumerate(tables):
+        codegen.load_compiled(table)
+        # разные mtime, чтобы порядок вытеснения не зависел от точности часов
+        os.utime(cache / f"tm_generated_{codegen.table_hash(table)[:16]}.py", (i, i))
+    assert sorted(os.listdir(cache)) == sorted(f"tm_generated_{codegen.table_hash(t)[:16]}.py" for t in tables[2:])
+
+
+def test_engine_resumes_and_keeps_interpreter_for_trace():
+    machine = TuringMachine("abcba")
+    for _ in range(7):
+        machine.step()
+    assert machine.run() and machine.step_count == 36
+
+    machine.load_tape("abcba")
+    steps = []
+    assert machine.run(steps) and len(steps) == 36
+    assert machine._compiled is not None  # модуль уже загружен первым run()
+
+    # лента поверх mmap выполняется интерпретатором
+    mapped = TuringMachine()
+    mapped.load_tape(MappedTape(b"aba"))
+    assert mapped.run() and mapped._compiled is None
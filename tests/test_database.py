@@ -0,0 +1,67 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+from tm import database
+from web.cache import FORMAT_VERSION, ResultCache
+from web.trace import Trace, simulate
+
+
+def _save_many(path, worker, count):
+    database.DB_PATH = path
+    for i in range(count):
+        database.save_result(f"w{worker}-{i}", i % 2 == 0, i)
+    return count
+
+
+def test_wal_mode_and_concurrent_writers(tmp_path, monkeypatch):
+    path = str(tmp_path / "history.db")
+    monkeypatch.setattr(database, "DB_PATH", path)
+    database.init_db()
+    conn = database.connect()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+
+    with ProcessPoolExecutor(4) as pool:
+        saved = sum(pool.map(_save_many, [path] * 4, range(4), [50] * 4))
+    conn = database.connect()
+    assert conn.execute("SELECT COUNT(*) FROM history").fetchone()[0] == saved == 200
+    conn.close()
+    assert len(database.get_history(20)) == 20
+
+    database.clear_history()
+    assert database.get_history(20) == []
+
+
+def test_result_cache_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first, second = ResultCache(path), ResultCache(path)
+    key = ResultCache.make_key("palindrome", "шалаш", 500)
+    assert second.get(key) is None
+
+    first.put(key, simulate("шалаш").to_data())
+    trace = Trace.from_data(second.get(key))
+    expected = simulate("шалаш")
+    assert trace.is_palindrome and trace.to_dict() == expected.to_dict()
+    assert trace.encoded(binary=True) == expected.encoded(binary=True)
+    assert second.stats() == {"hits": 1, "misses": 1}
+
+
+
+def test_result_cache_skips_large_values(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.db"), max_value_bytes=4096)
+    small, large = simulate("шалаш").to_data(), simulate("ab" * 1000).to_data()
+    assert "steps" not in small
+    assert cache.put("small", small) and not cache.put("large", large)
+    assert cache.get("small") == json.loads(json.dumps(small)) and cache.get("large") is None
+
+
+def test_result_cache_key_has_format_version():
+    key = ResultCache.make_key("palindrome", "шалаш", 500)
+    assert key.startswith(f"v{FORMAT_VERSION}\x00")
+
+
+def test_result_cache_evicts_oldest(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.db"), max_entries=3)
+    for i in range(5):
+        cache.put(str(i), i)
+    assert [cache.get(str(i)) for i in range(5)] == [None, None, 2, 3, 4]
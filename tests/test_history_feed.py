@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from tm import database
+from web.history_feed import HistoryFeed
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_PATH", str(tmp_path / "feed.db"))
+    database.init_db()
+
+
+def test_history_since_id(db):
+    for word in ("a", "b", "c"):
+        database.save_result(word, True, 1)
+    rows = database.get_history(20)
+    assert [r["word"] for r in rows] == ["c", "b", "a"]
+    assert [r["word"] for r in database.get_history(20, since_id=rows[1]["id"])] == ["c"]
+    assert database.get_history(20, since_id=rows[0]["id"]) == []
+    assert database.history_id_range() == (rows[2]["id"], rows[0]["id"])
+
+
+def test_feed_broadcasts_new_rows_and_clear(db):
+    async def scenario():
+        feed = HistoryFeed(interval=10)
+        database.save_result("old", True, 1)
+        first, second = await feed.subscribe(), await feed.subscribe()
+
+        await asyncio.to_thread(database.save_result, "new", False, 2)
+        feed.notify()
+        event = await asyncio.wait_for(first.get(), 5)
+        assert [r["word"] for r in event["rows"]] == ["new"]
+        assert (await asyncio.wait_for(second.get(), 5)) is event
+
+        feed.unsubscribe(second)
+        await asyncio.to_thread(database.clear_history)
+        feed.notify()
+        assert (await asyncio.wait_for(first.get(), 5)) == {"type": "clear"}
+        assert second.empty()
+        await feed.stop()
+
+    asyncio.run(scenario())
+
+
+def test_feed_detects_clear_followed_by_inserts(db):
+    async def scenario():
+        feed = HistoryFeed(interval=10)
+        database.save_result("a", True, 1)
+        database.save_result("b", True, 1)
+        await feed.subscribe()
+        await feed.stop()
+        # очистка и новая запись между двумя опросами: MAX(id) только вырос
+        database.clear_history()
+        database.save_result("c", True, 1)
+        events = feed.poll()
+        assert events[0] == {"type": "clear"}
+        assert [r["word"] for r in events[1]["rows"]] == ["c"]
+        assert feed.poll() == []
+
+    asyncio.run(scenario())
+
+
+def test_history_endpoint_since_id(db):
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+    from web.app_web import app
+
+    with TestClient(app) as client:
+        client.post("/check", json={"word": "aba"})
+        last = client.get("/history").json()[0]["id"]
+        assert client.get(f"/history?since_id={last}").json() == []
+        client.post("/check", json={"word": "abc"})
+        assert [r["word"] for r in client.get(f"/history?since_id={last}").json()] == ["abc"]
+
+
+def test_history_stream_events(db):
+    pytest.importorskip("fastapi")
+    from web import app_web
+
+    class FakeRequest:
+        def __init__(self):
+            self.polls = 0
+
+        async def is_disconnected(self):
+            self.polls += 1
+            return self.polls > 2
+
+    async def scenario():
+        database.save_result("aba", True, 16)
+        events = app_web.history_events(FakeRequest(), since_id=0)
+        backlog = await events.__anext__()
+        assert backlog.startswith("event: rows\nid: 1\n") and '"aba"' in backlog
+
+        await asyncio.to_thread(database.save_result, "abc", False, 5)
+        app_web.history_feed.notify()
+        live = await asyncio.wait_for(events.__anext__(), 5)
+        assert live.startswith("event: rows\nid: 2\n") and '"abc"' in live
+        await events.aclose()
+        await app_web.history_feed.stop()
+
+    asyncio.run(scenario())
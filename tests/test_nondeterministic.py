@@ -0,0 +1,103 @@
+import random
+
+import pytest
+
+from tm import nondeterministic
+from tm.nondeterministic import NondeterministicTuringMachine
+from tm.transitions import TransitionTable, get_table
+from tm.turing_machine import TuringMachine
+
+
+def run(table, word, **kwargs):
+    machine = NondeterministicTuringMachine(table, **kwargs)
+    machine.load_tape(word)
+    return machine.run(), machine
+
+
+@pytest.mark.parametrize("strategy", ["bfs", "iddfs"])
+def test_repeated_symbol_table(strategy):
+    table = get_table("repeated_symbol")
+    rng = random.Random(7)
+    for _ in range(200):
+        word = "".join(rng.choice("abcдё") for _ in range(rng.randint(0, 7)))
+        accepted, machine = run(table, word, strategy=strategy)
+        assert accepted == (len(set(word)) < len(word)), word
+        assert machine.complete
+
+
+def test_bfs_and_iddfs_find_shortest_branch():
+    table = get_table("repeated_symbol")
+    for word in ("abcb", "aXbXa", "шалаш", "abcdefgha"):
+        _, bfs = run(table, word)
+        _, iddfs = run(table, word, strategy="iddfs")
+        assert bfs.step_count == iddfs.step_count
+    # первая повторяющаяся пара — "b" на позициях 1 и 3: 1 шаг q0 + 3 шага q_seek
+    assert run(table, "abcb")[1].step_count == 4
+
+
+@pytest.mark.parametrize("strategy", ["bfs", "iddfs"])
+def test_deterministic_table_matches_turing_machine(strategy):
+    table = get_table("palindrome")
+    for word in ("", "a", "abba", "abca", "шалаш", "казаки"):
+        accepted, machine = run(table, word, strategy=strategy)
+        reference = TuringMachine(word)
+        assert (accepted, machine.step_count) == (reference.run(), reference.step_count)
+
+
+def test_visited_set_detects_loops():
+    loop = TransitionTable({
+        "q0": {"_any_": [("_any_", "S", "q0"), ("_any_", "R", "q1")]},
+        "q1": {"_any_": ("_any_", "L", "q0")},
+        "q_accept": {}, "q_reject": {},
+    })
+    accepted, machine = run(loop, "ab")
+    assert not accepted and machine.complete
+    assert machine.configurations <= 4
+
+
+def test_memory_cap_stops_search():
+    # каждая ветвь пишет свой символ и уходит вправо — конфигураций становится всё больше
+    grow = TransitionTable({
+        "q0": {"_any_": [("a", "R", "q0"), ("b", "R", "q0")]},
+        "q_accept": {}, "q_reject": {},
+    })
+    accepted, machine = run(grow, "", max_configs=100)
+    assert not accepted and not machine.complete
+    assert machine.configurations <= 100
+
+    # итеративное углубление не прерывается по памяти, а останавливается по глубине
+    machine = NondeterministicTuringMachine(grow, strategy="iddfs", max_configs=100)
+    machine.max_steps = 8
+    machine.load_tape("")
+    assert not machine.run() and not machine.complete
+
+
+def test_worker_pool_matches_sequential(monkeypatch):
+    monkeypatch.setattr(nondeterministic, "PARALLEL_MIN_FRONTIER", 2)
+    table = get_table("repeated_symbol")
+    for word in ("abcdefgc", "abcdefgh"):
+        sequential = run(table, word)
+        parallel = run(table, word, workers=2)
+        assert sequential[0] == parallel[0]
+        assert sequential[1].step_count == parallel[1].step_count
+
+
+def test_dict_roundtrip_and_guards():
+    table = get_table("repeated_symbol")
+    assert not table.is_deterministic()
+    restored = TransitionTable.from_dict(table.to_dict())
+    assert restored.transitions == table.transitions
+    with pytest.raises(ValueError):
+        TuringMachine(table)
+
+
+def test_mapped_tape_is_rejected(tmp_path):
+    from tm.cli import main
+    from tm.tape import MappedTape
+
+    machine = NondeterministicTuringMachine(get_table("repeated_symbol"))
+    with pytest.raises(ValueError, match="mmap"):
+        machine.load_tape(MappedTape(b"abca"))
+    path = tmp_path / "word.bin"
+    path.write_bytes(b"abca")
+    assert main(["--mmap", str(path), "--table", "repeated_symbol"]) == 2
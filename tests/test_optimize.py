@@ -0,0 +1,60 @@
+import itertools
+import random
+
+from tm.optimize import minimize_table, format_report
+from tm.turing_machine import TuringMachine, TransitionTable
+
+
+def outcomes(table, words, max_steps=2000):
+    results = []
+    for word in words:
+        m = TuringMachine(table)
+        m.max_steps = max_steps
+        m.load_tape(word)
+        results.append((m.run(), m.step_count, str(m.tape)))
+    return results
+
+
+def redundant_table():
+    # q1 и q2 эквивалентны, q_dead недостижимо, символы 'b' и 'c' ведут себя одинаково
+    return TransitionTable({
+        "q0": {"a": ("a", "R", "q1"), "b": ("Y", "R", "q2"), "c": ("Y", "R", "q1"), "⊔": ("⊔", "S", "q_reject")},
+        "q1": {"a": ("a", "R", "q1"), "b": ("b", "R", "q2"), "c": ("c", "R", "q1"), "⊔": ("⊔", "S", "q_accept")},
+        "q2": {"a": ("a", "R", "q2"), "b": ("b", "R", "q1"), "c": ("c", "R", "q2"), "⊔": ("⊔", "S", "q_accept")},
+        "q_dead": {"_any_": ("_any_", "L", "q_dead")},
+        "q_accept": {},
+        "q_reject": {},
+    })
+
+
+def test_minimize_merges_states_and_symbols():
+    table = redundant_table()
+    optimized, report = minimize_table(table)
+    assert report["unreachable_removed"] == 1
+    assert report["states_merged"] == 1
+    assert report["symbol_classes"] == 1
+    assert report["after"]["states"] < report["before"]["states"]
+    assert "q_dead" not in optimized
+    assert "→" in format_report(report)
+
+    words = ["".join(w) for n in range(5) for w in itertools.product("abcd", repeat=n)]
+    assert outcomes(optimized, words) == outcomes(table, words)
+
+
+def test_minimize_palindrome_table_preserves_behavior():
+    table = TransitionTable.strict_palindrome_table()
+    optimized, report = minimize_table(table)
+    assert report["after"]["entries"] < report["before"]["entries"]
+
+    rng = random.Random(3)
+    words = ["", "a", "aba", "абба", "abc", "Xa", "1"]
+    words += ["".join(rng.choice("abя") for _ in range(rng.randint(1, 7))) for _ in range(50)]
+    assert outcomes(optimized, words, 100_000) == outcomes(table, words, 100_000)
+
+
+def test_minimize_register_table_keeps_explicit_entries():
+    table = TransitionTable.palindrome_table()
+    optimized, _ = minimize_table(table)
+    assert "X" in optimized.transitions["q_check"]
+    words = ["", "a", "🙂a🙂", "12321", "1231", "XaX", "aXa", "ab⊔ba"]
+    assert outcomes(optimized, words) == outcomes(table, words)
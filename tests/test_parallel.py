@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from tm.parallel import palindrome_steps, verify_palindrome
+from tm.tape import MappedTape
+from tm.turing_machine import TuringMachine
+
+
+def sequential(word):
+    m = TuringMachine(word)
+    return m.run(), m.step_count
+
+
+def words(rng, count):
+    for _ in range(count):
+        n = rng.randint(0, 40)
+        word = "".join(rng.choice("abя") for _ in range(n))
+        if rng.random() < 0.5:
+            half = word[:n // 2]
+            word = half + word[n // 2:n - n // 2] + half[::-1]
+        yield word
+
+
+def test_matches_sequential_engine_in_process():
+    rng = random.Random(11)
+    for word in words(rng, 200):
+        result = verify_palindrome(word, workers=1, chunk_size=3)
+        assert (result["accepted"], result["steps"]) == sequential(word), word
+
+
+def test_matches_sequential_engine_with_worker_processes():
+    rng = random.Random(12)
+    for word in list(words(rng, 20)) + ["абвгдеёжзиизжёедгвба", "аб" * 15 + "в" + "ба" * 15]:
+        result = verify_palindrome(word, workers=2, chunk_size=2)
+        assert (result["accepted"], result["steps"]) == sequential(word), word
+
+
+def test_bytes_input_matches_mapped_tape():
+    data = "шалаш".encode("cp1251") * 3
+    m = TuringMachine()
+    m.load_tape(MappedTape(data, encoding="cp1251"))
+    accepted = m.run()
+    result = verify_palindrome(data, workers=2, chunk_size=1)
+    assert (result["accepted"], result["steps"]) == (accepted, m.step_count)
+
+
+def test_large_input_and_mismatch_position():
+    half = bytes(range(256)).replace(b"X", b"") * 2000
+    data = bytearray(half + half[::-1])
+    assert verify_palindrome(bytes(data), workers=2, chunk_size=100_000)["accepted"]
+    data[-12345] ^= 1
+    result = verify_palindrome(bytes(data), workers=2, chunk_size=100_000)
+    assert result["mismatch"] == 12344
+    assert result["steps"] == palindrome_steps(len(data), 12344)
+
+
+def test_reserved_symbols_rejected():
+    with pytest.raises(ValueError):
+        verify_palindrome("aXa")
+    with pytest.raises(ValueError):
+        verify_palindrome(b"aXa")
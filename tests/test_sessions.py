@@ -0,0 +1,124 @@
+import pytest
+
+from web.sessions import Session, SessionStore
+
+
+def apply(tape: list, delta: dict, blank="⊔"):
+    """Клиентская сторона: восстановить ленту по дельте."""
+    tape[:0] = [blank] * delta["shift"]
+    tape.extend([blank] * (delta["length"] - len(tape)))
+    pos, symbol = delta["write"]
+    tape[pos] = symbol
+
+
+def test_deltas_reconstruct_tape():
+    session = Session("s1")
+    snapshot = session.load("абвба")
+    tape = list(snapshot["tape"])
+    while not session.machine.is_halted():
+        apply(tape, session.step())
+        assert "".join(tape) == str(session.machine.tape)
+    assert "".join(tape) == str(session.machine.tape)
+    assert session.result()["is_palindrome"] is True
+
+
+def test_deltas_track_left_extension():
+    session = Session("s2")
+    session.machine.transitions = type(session.machine.transitions)({
+        "q0": {"_any_": ("Y", "L", "q1")},
+        "q1": {"_any_": ("Z", "S", "q_accept")},
+    })
+    tape = list(session.load("ab")["tape"])
+    for delta in session.run(5):
+        apply(tape, delta)
+    assert "".join(tape) == str(session.machine.tape) == "ZYb"
+
+
+def test_seek_and_reset():
+    session = Session("s3")
+    session.load("abcba")
+    session.run(7)
+    assert session.seek(3)["step"] == 3
+    assert session.seek(5)["step"] == 5
+    assert session.reset()["step"] == 0
+
+
+def test_store_ttl_eviction_and_capacity():
+    store = SessionStore(ttl=10, max_sessions=2)
+    a = store.get_or_create()
+    assert store.get_or_create(a.id) is a
+    b = store.get_or_create()
+    assert store.evict_expired(now=a.last_used + 5) == 0
+    store.get_or_create()  # вытесняет самую давнюю
+    assert len(store) == 2
+    assert store.evict_expired(now=b.last_used + 100) == 2
+
+
+
+def test_store_does_not_adopt_client_ids():
+    store = SessionStore()
+    first = store.get_or_create("1")
+    second = store.get_or_create("1")
+    assert first.id != "1" and second.id != "1"
+    assert first is not second
+    assert store.get_or_create(first.id) is first
+
+
+def test_seek_matches_stepping_and_does_not_reject():
+    session = Session("s4")
+    session.machine.max_steps = 1000
+    session.load("abcdcba")
+    stepped = Session("s5")
+    stepped.load("abcdcba")
+    stepped.run(9)
+    assert session.seek(9) == stepped.snapshot()
+    assert not session.snapshot()["halted"]
+    # перемотка за конец — к остановке, но не дальше лимита шагов
+    final = session.seek(10**9)
+    assert final["halted"] and final["state"] == "q_accept"
+    assert session.seek(2)["step"] == 2
+
+
+def test_websocket_protocol(tmp_path, monkeypatch):
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+    from tm import database
+    monkeypatch.setattr(database, "DB_PATH", str(tmp_path / "ws.db"))
+    from web.app_web import app
+
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws") as ws:
+            assert ws.receive_json()["type"] == "session"
+            assert ws.receive_json()["type"] == "snapshot"
+            ws.send_json({"cmd": "step"})
+            assert ws.receive_json()["type"] == "error"
+            ws.send_json({"cmd": "load", "word": "aba"})
+            assert ws.receive_json()["tape"] == "aba"
+            ws.send_json({"cmd": "step"})
+            delta = ws.receive_json()
+            assert delta["type"] == "delta" and delta["steps"][0]["step"] == 1
+            ws.send_json({"cmd": "run", "n": 1000})
+            steps = 1
+            while True:
+                message = ws.receive_json()
+                if message["type"] == "halted":
+                    break
+                steps += len(message["steps"])
+            assert message["is_palindrome"] is True
+            assert message["steps"] == steps
+
+            # после reset повторный прогон снова сообщает результат
+            ws.send_json({"cmd": "reset"})
+            assert ws.receive_json()["step"] == 0
+            ws.send_json({"cmd": "run", "n": 1000})
+            while (message := ws.receive_json())["type"] != "halted":
+                pass
+            assert message["steps"] == steps
+
+            # seek назад и затем на остановку: snapshot и сразу результат
+            ws.send_json({"cmd": "seek", "step": 2})
+            assert not ws.receive_json()["halted"]
+            ws.send_json({"cmd": "seek", "step": steps})
+            assert ws.receive_json()["halted"]
+            assert ws.receive_json()["type"] == "halted"
+        assert [r["word"] for r in database.get_history(5)] == ["aba"] * 3
@@ -0,0 +1,58 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Бюджет времени импорта (секунды) — с запасом для медленных CI-машин
+IMPORT_BUDGET = {
+    "tm": 0.05,
+    "tm.cli": 0.15,
+}
+
+HEAVY_MODULES = ("PySide6", "fastapi", "sqlite3", "numpy")
+
+
+def import_report(module: str) -> dict:
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "loaded = sorted(m for m in sys.modules if m.startswith('tm.'))\n"
+        "print(json.dumps({'elapsed': elapsed, 'heavy': heavy, 'loaded': loaded}))\n"
+    )
+    # лучший из нескольких запусков, чтобы не зависеть от холодного дискового кэша
+    reports = [
+        json.loads(subprocess.run([sys.executable, "-c", code], capture_output=True,
+                                  text=True, check=True, cwd=ROOT).stdout)
+        for _ in range(3)
+    ]
+    return min(reports, key=lambda r: r["elapsed"])
+
+
+def test_import_tm_is_lazy():
+    report = import_report("tm")
+    assert report["loaded"] == []
+    assert report["elapsed"] < IMPORT_BUDGET["tm"]
+
+
+def test_import_cli_within_budget():
+    report = import_report("tm.cli")
+    assert report["heavy"] == []
+    assert report["elapsed"] < IMPORT_BUDGET["tm.cli"]
+
+
+def test_lazy_attribute_access():
+    import tm
+    table = tm.get_table("strict_palindrome")
+    assert table is tm.get_table("strict_palindrome")
+    assert isinstance(tm.TuringMachine("aba").transitions, tm.TransitionTable)
+
+
+def test_main_module_does_not_import_qt():
+    code = "import sys, main; print('PySide6' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=ROOT).stdout
+    assert out.strip() == "False"
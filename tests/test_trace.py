@@ -0,0 +1,52 @@
+import gzip
+import json
+
+import pytest
+
+from tm.transitions import TransitionTable
+from web.trace import BINARY_MEDIA_TYPE, choose_encoding, decode_binary, simulate
+
+
+@pytest.mark.parametrize("word", ["шалаш", "abcba", "abca", "🙂a🙂", "а" * 40 + "б"])
+def test_binary_roundtrip_palindrome_table(word):
+    trace = simulate(word)
+    assert decode_binary(trace.encoded(binary=True)) == trace.to_dict()
+
+
+def test_binary_roundtrip_left_extension_and_no_transition():
+    table = TransitionTable({
+        "q0": {"a": ("b", "L", "q1")},
+        "q1": {"⊔": ("⊔", "L", "q2")},
+        "q2": {"x": ("x", "S", "q_accept")},
+    })
+    trace = simulate("ab", table=table)
+    assert trace.steps[-1]["action"].startswith("Машина считывает символ «⊔». Нет перехода")
+    assert decode_binary(trace.encoded(binary=True)) == trace.to_dict()
+
+
+def test_binary_is_much_smaller_than_json():
+    trace = simulate("абвгдеёжзи" * 2)
+    assert len(trace.encoded(binary=True)) * 10 < len(trace.encoded())
+
+
+def test_choose_encoding():
+    assert choose_encoding("gzip, deflate", 10_000) == "gzip"
+    assert choose_encoding("gzip;q=0, deflate", 10_000) is None
+    assert choose_encoding("gzip", 10) is None
+
+
+def test_check_content_negotiation(tmp_path, monkeypatch):
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+    from tm import database
+    monkeypatch.setattr(database, "DB_PATH", str(tmp_path / "trace.db"))
+    from web.app_web import app
+
+    with TestClient(app) as client:
+        plain = client.post("/check", json={"word": "шалаш"}, headers={"Accept-Encoding": "identity"})
+        binary = client.post("/check", json={"word": "шалаш"},
+                             headers={"Accept": BINARY_MEDIA_TYPE, "Accept-Encoding": "gzip"})
+    assert plain.headers["content-type"].startswith("application/json")
+    assert binary.headers["content-type"] == BINARY_MEDIA_TYPE
+    assert decode_binary(binary.content) == plain.json()
+    assert json.loads(gzip.decompress(simulate("шалаш").encoded(False, "gzip"))) == plain.json()
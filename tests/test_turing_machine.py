@@ -1,5 +1,5 @@
 import pytest
-from tm.tape import Tape
+from tm.tape import Tape, MappedTape
 from tm.turing_machine import TuringMachine, TransitionTable
 
 
@@ -37,6 +37,46 @@ def test_tape_repr():
     assert "<Tape xyz>" in repr(tape)
 
 
+def test_tape_extend_left():
+    tape = Tape("ab")
+    tape.extend_left()
+    assert str(tape) == "⊔ab"
+
+
+def test_mapped_tape_copy_on_write():
+    data = b"abc"
+    tape = MappedTape(data)
+    assert tape.read(1) == "b"
+    tape.write(1, "X")
+    tape.write(4, "z")
+    assert str(tape) == "aXc⊔z"
+    assert data == b"abc"
+    assert set(tape.overlay) == {1, 4}
+
+
+def test_mapped_tape_extend_left_and_encoding():
+    tape = MappedTape("шалаш".encode("cp1251"), encoding="cp1251")
+    tape.extend_left()
+    assert tape.read(0) == "⊔"
+    assert tape.read(1) == "ш"
+    assert len(tape) == 6
+
+
+def test_mapped_tape_rejects_multibyte_encoding():
+    with pytest.raises(ValueError):
+        MappedTape(b"abc", encoding="utf-8")
+
+
+def test_machine_on_mapped_tape_matches_list_tape():
+    for word in ["abba", "abca", "", "x", "казак"]:
+        plain = TuringMachine(TransitionTable.strict_palindrome_table())
+        plain.load_tape(word)
+        mapped = TuringMachine(TransitionTable.strict_palindrome_table())
+        mapped.load_tape(MappedTape(word.encode("cp1251"), encoding="cp1251"))
+        assert plain.run() == mapped.run()
+        assert plain.step_count == mapped.step_count
+
+
 # --- TransitionTable tests ---
 
 def test_basic_transition_lookup():
@@ -122,3 +162,39 @@ def test_run_does_not_exceed_max_steps():
     result = m.run()
     assert not result  # должно быть отклонено по лимиту
     assert m.state == m.reject_state
+
+
+# --- Register ("_reg_") tests ---
+
+def test_register_lookup_order():
+    table = TransitionTable({
+        "q0": {"a": ("a", "S", "q1"), "_reg_": ("r", "S", "q2"), "_any_": ("x", "S", "q3")}
+    })
+    assert table.get("q0", "a", register="a") == ("a", "S", "q1")  # точный символ важнее
+    assert table.get("q0", "b", register="b") == ("r", "S", "q2")
+    assert table.get("q0", "b", register="c") == ("x", "S", "q3")
+    assert table.get("q0", "b") == ("x", "S", "q3")
+
+
+def test_palindrome_table_unicode_alphabet():
+    for word, expected in [("12321", True), ("Аргентина манит негра", False), ("🙂ab🙂", False),
+                           ("🙂a🙂", True), ("ÉtÉ", True), ("", True), ("7", True), ("Zz", False)]:
+        m = TuringMachine(word)
+        assert m.run() is expected, word
+
+
+def test_palindrome_table_matches_strict_step_counts():
+    strict = TransitionTable.strict_palindrome_table()
+    generic = TransitionTable.palindrome_table()
+    for word in ["aba", "abba", "abc", "шалаш", "казак", "ab", "a"]:
+        a, b = TuringMachine(strict), TuringMachine(generic)
+        a.load_tape(word)
+        b.load_tape(word)
+        assert a.run() == b.run()
+        assert a.step_count == b.step_count
+
+
+def test_palindrome_table_size_independent_of_alphabet():
+    table = TransitionTable.palindrome_table()
+    assert len(table.transitions) == 6
+    assert len(TransitionTable.strict_palindrome_table().transitions) > 100
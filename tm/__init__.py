@@ -0,0 +1,36 @@
+# tm/__init__.py
+"""
+Машина Тьюринга: лента, таблица переходов и сам автомат.
+
+Подмодули загружаются лениво при первом обращении к атрибуту пакета,
+поэтому `import tm` почти ничего не стоит:
+
+    import tm
+    machine = tm.TuringMachine(tm.get_table("palindrome"))
+"""
+import importlib
+
+# имя атрибута → подмодуль, в котором он определён
+_EXPORTS = {
+    "Tape": "tm.tape",
+    "MappedTape": "tm.tape",
+    "TransitionTable": "tm.transitions",
+    "TABLES": "tm.transitions",
+    "get_table": "tm.transitions",
+    "TuringMachine": "tm.turing_machine",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'tm' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
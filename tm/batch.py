@@ -0,0 +1,199 @@
+# tm/batch.py
+import numpy as np
+
+from .transitions import TransitionTable
+
+
+class BatchTuringMachine:
+    """
+    Пакетный симулятор: прогоняет много слов по одной таблице переходов одновременно.
+
+    Ленты всех слов хранятся в двумерном массиве NumPy (строка — слово,
+    символы закодированы индексами алфавита), положения головок и состояния —
+    в векторах. Один шаг выполняется для всех ещё работающих машин сразу
+    векторизованной выборкой из таблиц write/move/next; остановившиеся
+    машины исключаются маской.
+
+    Результаты совпадают с TuringMachine.run(): принятие/отклонение
+    и количество шагов step_count для каждого слова.
+    """
+    def __init__(self, transitions: TransitionTable, start_state: str = "q0",
+                 accept_state: str = "q_accept", reject_state: str = "q_reject",
+                 blank: str = "⊔", max_steps: int = 100_000):
+        if not transitions.is_deterministic():
+            raise ValueError("Пакетный режим поддерживает только детерминированные таблицы.")
+        self.transitions = transitions
+        self.start_state = start_state
+        self.accept_state = accept_state
+        self.reject_state = reject_state
+        self.blank = blank
+        self.max_steps = max_steps
+
+    # ========================== КОМПИЛЯЦИЯ ТАБЛИЦЫ ==============================
+    def _collect_states(self):
+        states = [self.start_state, self.accept_state, self.reject_state]
+        for state, row in self.transitions.transitions.items():
+            states.append(state)
+            for trans in row.values():
+                states.append(trans[2])
+        return list(dict.fromkeys(states))
+
+    def _collect_symbols(self, words):
+        symbols = [self.blank]
+        for row in self.transitions.transitions.values():
+            for symbol, trans in row.items():
+                if symbol != "_any_":
+                    symbols.append(symbol)
+                if trans[0] != "_any_":
+                    symbols.append(trans[0])
+        for word in words:
+            symbols.extend(word)
+        return list(dict.fromkeys(symbols))
+
+    def _fill(self, states, symbols, state_index, symbol_index, matched: bool):
+        """
+        Плотные массивы [состояние, символ] для одного варианта поиска перехода:
+        matched=False — регистр не совпадает с символом, True — совпадает ("_reg_").
+        """
+        shape = (len(states), len(symbols))
+        write = np.tile(np.arange(len(symbols), dtype=np.int32), (len(states), 1))
+        move = np.zeros(shape, dtype=np.int64)
+        nxt = np.full(shape, state_index[self.reject_state], dtype=np.int32)
+        # counted=0 — перехода нет: машина отклоняет слово, не увеличивая step_count
+        counted = np.zeros(shape, dtype=np.int64)
+        store = np.zeros(shape, dtype=bool)
+        offsets = {"L": -1, "R": 1, "S": 0}
+
+        for state, si in state_index.items():
+            for symbol, ci in symbol_index.items():
+                trans = self.transitions.get(state, symbol, symbol if matched else None)
+                if trans is None:
+                    continue
+                write_sym, direction, new_state = trans[:3]
+                if direction not in offsets:
+                    raise ValueError(f"Неизвестное направление движения: {direction}")
+                if len(trans) > 3:
+                    if trans[3] != "store":
+                        raise ValueError(f"Неизвестная операция с регистром: {trans[3]}")
+                    store[si, ci] = True
+                if write_sym != "_any_":
+                    write[si, ci] = symbol_index[write_sym]
+                move[si, ci] = offsets[direction]
+                nxt[si, ci] = state_index[new_state]
+                counted[si, ci] = 1
+        return write, move, nxt, counted, store
+
+    def compile(self, words):
+        """
+        Строит плотные таблицы переходов [состояние, символ] по алфавиту,
+        включающему все символы таблицы и входных слов.
+        Если в таблице есть переходы "_reg_", строится второй набор массивов
+        для случая, когда символ совпадает с регистром.
+        """
+        states = self._collect_states()
+        symbols = self._collect_symbols(words)
+        state_index = {s: i for i, s in enumerate(states)}
+        symbol_index = {s: i for i, s in enumerate(symbols)}
+
+        uses_register = any("_reg_" in row for row in self.transitions.transitions.values())
+        tables = [self._fill(states, symbols, state_index, symbol_index, matched=False)]
+        if uses_register:
+            tables.append(self._fill(states, symbols, state_index, symbol_index, matched=True))
+
+        halting = np.zeros(len(states), dtype=bool)
+        halting[state_index[self.accept_state]] = True
+        halting[state_index[self.reject_state]] = True
+
+        return {
+            "states": states,
+            "symbols": symbols,
+            "symbol_index": symbol_index,
+            # (write, move, next, counted, store) без совпадения с регистром и с совпадением
+            "tables": tables,
+            "halting": halting,
+        }
+
+    # ========================== ВЫПОЛНЕНИЕ ==============================
+    def run(self, words):
+        """
+        Запускает машину на всех словах до остановки или max_steps.
+        Возвращает (accepted, steps): булев вектор и вектор количества шагов.
+        """
+        words = list(words)
+        n = len(words)
+        if n == 0:
+            return np.zeros(0, dtype=bool), np.zeros(0, dtype=np.int64)
+
+        c = self.compile(words)
+        symbol_index = c["symbol_index"]
+        blank = symbol_index[self.blank]
+        halting = c["halting"]
+        tables = c["tables"]
+
+        width = max(1, max(len(w) for w in words)) + 1
+        tape = np.full((n, width), blank, dtype=np.int32)
+        for row, word in enumerate(words):
+            if word:
+                tape[row, :len(word)] = [symbol_index[ch] for ch in word]
+
+        head = np.zeros(n, dtype=np.int64)
+        state = np.full(n, c["states"].index(self.start_state), dtype=np.int32)
+        steps = np.zeros(n, dtype=np.int64)
+        register = np.full(n, -1, dtype=np.int32)
+        # номер итерации run(), на которой машина остановилась
+        halted_at = np.full(n, self.max_steps, dtype=np.int64)
+        halted_at[halting[state]] = 0
+        live = np.flatnonzero(~halting[state])
+
+        iteration = 0
+        while live.size and iteration < self.max_steps:
+            h = head[live]
+            s = state[live]
+            sym = tape[live, h]
+
+            write, move, nxt, counted, store = tables[0]
+            w, m, ns, cnt, st = write[s, sym], move[s, sym], nxt[s, sym], counted[s, sym], store[s, sym]
+            if len(tables) > 1:
+                matched = sym == register[live]
+                if matched.any():
+                    write, move, nxt, counted, store = tables[1]
+                    w = np.where(matched, write[s, sym], w)
+                    m = np.where(matched, move[s, sym], m)
+                    ns = np.where(matched, nxt[s, sym], ns)
+                    cnt = np.where(matched, counted[s, sym], cnt)
+                    st = np.where(matched, store[s, sym], st)
+                if st.any():
+                    register[live[st]] = sym[st]
+
+            tape[live, h] = w
+            steps[live] += cnt
+            h = h + m
+            s = ns
+            head[live] = h
+            state[live] = s
+            iteration += 1
+
+            # расширение ленты влево/вправо для всех строк сразу
+            if h.size and h.min() < 0:
+                pad = max(16, width // 2)
+                tape = np.concatenate([np.full((n, pad), blank, dtype=np.int32), tape], axis=1)
+                head += pad
+                h += pad
+                width += pad
+            if h.size and h.max() >= width:
+                pad = max(16, width // 2)
+                tape = np.concatenate([tape, np.full((n, pad), blank, dtype=np.int32)], axis=1)
+                width += pad
+
+            stopped = halting[s]
+            if stopped.any():
+                halted_at[live[stopped]] = iteration
+                live = live[~stopped]
+
+        accept = c["states"].index(self.accept_state)
+        # как и TuringMachine.run(): остановка ровно на последней итерации считается превышением лимита
+        accepted = (state == accept) & (halted_at < self.max_steps)
+        return accepted, steps
+
+    def __repr__(self):
+        return f"<BatchTuringMachine {self.transitions!r}>"
@@ -0,0 +1,264 @@
+# tm/cli.py
+"""
+Консольный запуск машины Тьюринга без графического и веб-интерфейса.
+
+    python -m tm шалаш казак abc
+    cat words.txt | python -m tm --jsonl --workers 4
+    python -m tm --input words.txt --table my_table.json --max-steps 5000 --trace
+    python -m tm --mmap input.txt --encoding cp1251 --max-steps 10000000
+    python -m tm --mmap big.txt --parallel --workers 8
+    python -m tm --table repeated_symbol --search iddfs abcb
+
+Модуль не импортирует PySide6, FastAPI и sqlite3, поэтому подходит
+для пакетных заданий на серверах без дисплея.
+"""
+import argparse
+import json
+import os
+import sys
+
+from .nondeterministic import NondeterministicTuringMachine
+from .tape import MappedTape
+from .transitions import TABLES, TransitionTable, get_table
+from .turing_machine import TuringMachine
+
+
+# Параметры машины, которые можно задать в JSON-файле таблицы
+MACHINE_OPTIONS = ("start_state", "accept_state", "reject_state", "blank")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m tm", description="Машина Тьюринга — проверка палиндромов")
+    parser.add_argument("words", nargs="*", help="слова для проверки (если не заданы — читаются из stdin)")
+    parser.add_argument("--input", "-i", metavar="PATH", action="append", default=[],
+                        help="файл со словами, по одному в строке ('-' — stdin); можно указать несколько раз")
+    parser.add_argument("--table", "-t", default="palindrome",
+                        help=f"имя встроенной таблицы ({', '.join(sorted(TABLES))}) или путь к JSON-файлу")
+    parser.add_argument("--jsonl", action="store_true", help="выводить результаты в формате JSON Lines")
+    parser.add_argument("--workers", "-w", type=int, default=1, help="количество процессов для параллельной проверки")
+    parser.add_argument("--max-steps", type=int, default=None,
+                        help="лимит шагов машины (по умолчанию как у TuringMachine)")
+    parser.add_argument("--trace", action="store_true", help="выводить описание каждого шага")
+    parser.add_argument("--optimize", action="store_true",
+                        help="минимизировать таблицу перед запуском (отчёт о размерах — в stderr)")
+    parser.add_argument("--mmap", metavar="PATH",
+                        help="файл, содержимое которого целиком — входное слово (читается через mmap без копирования)")
+    parser.add_argument("--encoding", default="latin-1",
+                        help="однобайтовая кодировка файла для --mmap (latin-1, cp1251, ...)")
+    parser.add_argument("--parallel", action="store_true",
+                        help="с --mmap: проверить палиндром по кускам ленты в --workers процессах "
+                             "(только таблица palindrome, --max-steps не ограничивает; "
+                             "файл с символом X проверяется последовательно)")
+    parser.add_argument("--search", choices=("bfs", "iddfs"), default="bfs",
+                        help="для недетерминированной таблицы: поиск в ширину или итеративное углубление")
+    parser.add_argument("--max-configs", type=int, default=1_000_000,
+                        help="для недетерминированной таблицы: максимум хранимых конфигураций")
+    return parser
+
+
+def load_spec(source: str) -> dict:
+    """
+    Описание машины, которое можно передать в другой процесс.
+    source — имя встроенной таблицы или путь к JSON-файлу вида
+    {"transitions": {...}, "start_state": "q0", "accept_state": ..., "reject_state": ..., "blank": ...}.
+    """
+    if source in TABLES:
+        return {"table": source}
+    if not os.path.isfile(source):
+        raise ValueError(f"Неизвестная таблица {source!r}: ожидается одно из {sorted(TABLES)} или путь к JSON-файлу.")
+    with open(source, encoding="utf-8") as f:
+        data = json.load(f)
+    if "transitions" not in data:
+        raise ValueError(f"В файле {source} нет ключа 'transitions'.")
+    spec = {"transitions": data["transitions"], "symbol_classes": data.get("symbol_classes")}
+    spec.update({key: data[key] for key in MACHINE_OPTIONS if key in data})
+    return spec
+
+
+def _state_options(spec: dict) -> dict:
+    return {key: spec[key] for key in ("start_state", "accept_state", "reject_state") if key in spec}
+
+
+def build_table(spec: dict) -> TransitionTable:
+    if "table" in spec:
+        table = get_table(spec["table"])
+    else:
+        table = TransitionTable.from_dict(spec["transitions"], spec.get("symbol_classes"))
+    if spec.get("optimize"):
+        from .optimize import minimize_table
+        table, _ = minimize_table(table, **_state_options(spec))
+    return table
+
+
+def build_machine(spec: dict, max_steps=None):
+    """TuringMachine или, если в таблице есть списки переходов, NondeterministicTuringMachine."""
+    table = build_table(spec)
+    options = {key: spec[key] for key in MACHINE_OPTIONS if key in spec}
+    if table.is_deterministic():
+        machine = TuringMachine(table, **options)
+    else:
+        machine = NondeterministicTuringMachine(
+            table, strategy=spec.get("search", "bfs"), max_configs=spec.get("max_configs", 1_000_000), **options
+        )
+    if max_steps is not None:
+        machine.max_steps = max_steps
+    return machine
+
+
+def check_word(machine: TuringMachine, word, trace: bool = False) -> dict:
+    """Прогоняет одно слово (строку или ленту) и возвращает результат в виде словаря."""
+    steps = [] if trace else None
+    machine.load_tape(word)
+    accepted = machine.run(steps)
+    result = {
+        "word": word if isinstance(word, str) else None,
+        "accepted": accepted,
+        "state": machine.state,
+        "steps": machine.step_count,
+        "result": machine.get_result(),
+    }
+    if isinstance(machine, NondeterministicTuringMachine):
+        result["configurations"] = machine.configurations
+        result["complete"] = machine.complete
+    if trace:
+        result["trace"] = steps
+    return result
+
+
+# --- Параллельная проверка: у каждого процесса своя машина ---
+
+_worker_machine = None
+_worker_trace = False
+
+
+def _init_worker(spec: dict, max_steps, trace: bool):
+    global _worker_machine, _worker_trace
+    _worker_machine = build_machine(spec, max_steps)
+    _worker_trace = trace
+
+
+def _check_in_worker(word: str) -> dict:
+    return check_word(_worker_machine, word, _worker_trace)
+
+
+def iter_words(args):
+    """Слова из аргументов, затем из файлов --input; stdin — если ничего не задано."""
+    yield from args.words
+    sources = args.input or ([] if args.words else ["-"])
+    for source in sources:
+        f = sys.stdin if source == "-" else open(source, encoding="utf-8")
+        try:
+            for line in f:
+                word = line.rstrip("\r\n")
+                if word:
+                    yield word
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+
+def iter_chunks(items, size: int):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_results(spec: dict, words, workers: int = 1, max_steps=None, trace: bool = False):
+    """
+    Результаты в порядке входных слов. При workers > 1 слова обрабатываются
+    порциями в пуле процессов, так что вывод идёт потоком, не дожидаясь конца входа.
+    """
+    if workers <= 1:
+        machine = build_machine(spec, max_steps)
+        for word in words:
+            yield check_word(machine, word, trace)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(spec, max_steps, trace)) as pool:
+        for chunk in iter_chunks(words, workers * 64):
+            yield from pool.map(_check_in_worker, chunk, chunksize=16)
+
+
+def run_mapped(spec: dict, path: str, encoding: str, max_steps=None, trace: bool = False) -> dict:
+    """Прогоняет машину по файлу, не загружая его в список символов."""
+    machine = build_machine(spec, max_steps)
+    with open(path, "rb") as f:
+        tape = MappedTape.from_file(f, blank=machine.blank, encoding=encoding)
+        result = check_word(machine, tape, trace)
+        result["word"] = path
+        result["touched"] = len(tape.overlay)
+        if hasattr(tape.data, "close"):
+            tape.data.close()
+    return result
+
+
+def run_parallel(spec: dict, path: str, encoding: str, workers: int, max_steps=None) -> dict:
+    """
+    Проверка файла по зеркальным кускам в нескольких процессах (tm/parallel.py).
+    Служебный символ X машина обрабатывает особо, поэтому файл, в котором он есть,
+    выполняется последовательно (run_mapped).
+    """
+    from .parallel import verify_palindrome
+    with open(path, "rb") as f:
+        data = MappedTape.from_file(f).data
+        try:
+            verdict = None if data.find(b"X") != -1 else verify_palindrome(data, workers)
+        finally:
+            if hasattr(data, "close"):
+                data.close()
+    if verdict is None:
+        return run_mapped(spec, path, encoding, max_steps)
+    machine = TuringMachine()
+    machine.state = machine.accept_state if verdict["accepted"] else machine.reject_state
+    return {
+        "word": path,
+        "accepted": verdict["accepted"],
+        "state": machine.state,
+        "steps": verdict["steps"],
+        "result": machine.get_result(),
+    }
+
+
+def write_result(result: dict, jsonl: bool, out=None):
+    out = out or sys.stdout
+    if jsonl:
+        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    else:
+        for action in result.get("trace", ()):
+            out.write(f"  {action}\n")
+        out.write(f"{result['word']}: {result['result']} (шагов: {result['steps']})\n")
+    out.flush()
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        spec = load_spec(args.table)
+        spec.update(search=args.search, max_configs=args.max_configs)
+        if args.optimize:
+            from .optimize import minimize_table, format_report
+            _, report = minimize_table(build_table(spec), **_state_options(spec))
+            print(format_report(report), file=sys.stderr)
+            spec["optimize"] = True
+        if args.parallel:
+            if not args.mmap or args.table != "palindrome" or args.trace:
+                raise ValueError("--parallel работает только с --mmap и таблицей palindrome, без --trace.")
+            results = [run_parallel(spec, args.mmap, args.encoding, args.workers, args.max_steps)]
+        elif args.mmap:
+            results = [run_mapped(spec, args.mmap, args.encoding, args.max_steps, args.trace)]
+        else:
+            results = iter_results(spec, iter_words(args), args.workers, args.max_steps, args.trace)
+        for result in results:
+            write_result(result, args.jsonl)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        return 130
+    return 0
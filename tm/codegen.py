@@ -0,0 +1,337 @@
+# tm/codegen.py
+"""
+Генерация Python-кода по таблице переходов.
+
+Интерпретатор на каждом шаге вызывает несколько методов (read_symbol,
+transitions.get, write_symbol, move_head) и форматирует текст действия.
+Здесь таблица заранее превращается в модуль с одной функцией run(), в которой
+лента, головка, состояние и регистр — локальные переменные, состояние —
+целое число, а каждое состояние — ветвь match. При большом числе состояний
+(или переходов в состоянии) ветви группируются в двоичное дерево if,
+чтобы выбор ветви занимал O(log n) сравнений.
+
+До Python 3.10 вместо match генерируется цепочка if/elif.
+
+Модули кэшируются на диске по хэшу таблицы (TM_CODEGEN_DIR, по умолчанию
+~/.cache/tm_codegen; хранятся CACHE_MAX_FILES последних использованных)
+и в памяти процесса. TuringMachine.run подхватывает их автоматически
+(отключается переменной окружения TM_CODEGEN=0). Поведение, включая
+step_count, совпадает с интерпретатором. Если таблицу скомпилировать
+нельзя (например, в ней есть переход короче трёх элементов),
+load_compiled возвращает None и машина работает через интерпретатор.
+
+В памяти модуль привязан к объекту таблицы, поэтому таблицу после первого
+запуска изменять нельзя (как и общие таблицы из get_table) — для изменённой
+таблицы нужно создать новый TransitionTable.
+"""
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import warnings
+import weakref
+
+from .transitions import TransitionTable
+
+
+# Меняется при изменении генератора — старые модули в кэше перестают совпадать по хэшу
+GENERATOR_VERSION = 1
+# Сколько ветвей match допускается в одном узле дерева
+MATCH_LEAF = 8
+# До скольких символов в состоянии выбор идёт сравнениями, дальше — через словарь
+INLINE_SYMBOLS = 4
+# match появился в Python 3.10; на более старых версиях — цепочка if/elif
+USE_MATCH = sys.version_info >= (3, 10)
+# Сколько модулей хранить в каталоге кэша (вытесняются давно не использованные)
+CACHE_MAX_FILES = 256
+
+# хэш таблицы → модуль; объект таблицы → {(accept, reject): модуль}, чтобы не считать хэш повторно
+_loaded = {}
+_by_table = weakref.WeakKeyDictionary()
+
+
+def cache_dir() -> str:
+    return os.environ.get("TM_CODEGEN_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "tm_codegen")
+
+
+def table_hash(table: TransitionTable, accept_state: str = "q_accept", reject_state: str = "q_reject") -> str:
+    data = {
+        "version": GENERATOR_VERSION,
+        "transitions": table.to_dict(),
+        "symbol_classes": table.symbol_classes,
+        "accept": accept_state,
+        "reject": reject_state,
+        "match": USE_MATCH,
+    }
+    return hashlib.sha256(json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+# ========================== ГЕНЕРАЦИЯ ==============================
+
+def _tree(var: str, keys: list, leaf, indent: str) -> list:
+    """Выбор по целому var: match (или if/elif) для небольших групп, бинарное разбиение для больших."""
+    if len(keys) == 1:
+        return leaf(keys[0], indent)
+    if len(keys) <= MATCH_LEAF and USE_MATCH:
+        lines = [f"{indent}match {var}:"]
+        for i, key in enumerate(keys):
+            case = "_" if i == len(keys) - 1 else str(key)
+            lines.append(f"{indent}    case {case}:")
+            lines.extend(leaf(key, indent + "        "))
+        return lines
+    if len(keys) <= MATCH_LEAF:
+        lines = []
+        for i, key in enumerate(keys):
+            if i == len(keys) - 1:
+                lines.append(f"{indent}else:")
+            else:
+                lines.append(f"{indent}{'elif' if i else 'if'} {var} == {key}:")
+            lines.extend(leaf(key, indent + "    "))
+        return lines
+    mid = len(keys) // 2
+    return (
+        [f"{indent}if {var} < {keys[mid]}:"]
+        + _tree(var, keys[:mid], leaf, indent + "    ")
+        + [f"{indent}else:"]
+        + _tree(var, keys[mid:], leaf, indent + "    ")
+    )
+
+
+def _action(trans, state_ids: dict, indent: str, symbol: str = None) -> list:
+    """Код одного перехода (повторяет TuringMachine.step). symbol — прочитанный символ, если известен."""
+    if trans is None:
+        return [f"{indent}state = 1  # нет перехода — отклонено"]
+    write_sym, direction, new_state = trans[:3]
+    lines = []
+    if len(trans) > 3:
+        if trans[3] != "store":
+            return [f"{indent}raise ValueError({'Неизвестная операция с регистром: ' + str(trans[3])!r})"]
+        lines.append(f"{indent}register = sym")
+    if write_sym != "_any_" and write_sym != symbol:
+        lines.append(f"{indent}cells[head] = {write_sym!r}")
+    if direction == "L":
+        lines += [
+            f"{indent}if head:",
+            f"{indent}    head -= 1",
+            f"{indent}else:",
+            f"{indent}    cells.insert(0, blank)",
+            f"{indent}    n += 1",
+            f"{indent}    shift += 1",
+        ]
+    elif direction == "R":
+        lines += [
+            f"{indent}head += 1",
+            f"{indent}if head == n:",
+            f"{indent}    cells.append(blank)",
+            f"{indent}    n += 1",
+        ]
+    elif direction != "S":
+        lines.append(f"{indent}raise ValueError({'Неизвестное направление движения: ' + str(direction)!r})")
+        return lines
+    lines += [f"{indent}state = {state_ids[new_state]}", f"{indent}steps += 1"]
+    return lines
+
+
+def _state_body(table: TransitionTable, state: str, state_ids: dict, number: int, constants: list, indent: str) -> list:
+    """Выбор перехода по текущему символу в одном состоянии."""
+    row = table.transitions.get(state, {})
+    # символ → переход: точные ключи, затем символы классов (как в TransitionTable.get)
+    mapping = {}
+    class_keys = {key for key in row if key in set(table.symbol_classes.values())}
+    for symbol, symbol_class in table.symbol_classes.items():
+        if symbol_class in class_keys:
+            mapping[symbol] = row[symbol_class]
+    mapping.update(row)
+    reg = row.get("_reg_")
+    default = row.get("_any_")
+
+    if len(mapping) <= INLINE_SYMBOLS:
+        lines = []
+        keyword = "if"
+        for symbol, trans in mapping.items():
+            if symbol in ("_any_", "_reg_"):
+                continue
+            lines.append(f"{indent}{keyword} sym == {symbol!r}:")
+            lines.extend(_action(trans, state_ids, indent + "    ", symbol))
+            keyword = "elif"
+        if reg is not None:
+            lines.append(f"{indent}{keyword} sym == register:")
+            lines.extend(_action(reg, state_ids, indent + "    "))
+            keyword = "elif"
+        if keyword == "if":
+            return _action(default, state_ids, indent)
+        lines.append(f"{indent}else:")
+        lines.extend(_action(default, state_ids, indent + "    "))
+        return lines
+
+    # много символов: словарь символ → номер перехода и дерево по номеру
+    actions = []
+    action_ids = {}
+    for trans in list(mapping.values()) + [reg, default]:
+        if trans is not None and trans not in action_ids:
+            action_ids[trans] = len(actions)
+            actions.append(trans)
+    none_id = len(actions)
+    table_name = f"_D{number}"
+    constants.append(f"{table_name} = {{{', '.join(f'{s!r}: {action_ids[t]}' for s, t in mapping.items())}}}")
+    miss = action_ids[default] if default is not None else none_id
+    lines = [f"{indent}a = {table_name}.get(sym, -1)", f"{indent}if a < 0:"]
+    if reg is not None:
+        lines.append(f"{indent}    a = {action_ids[reg]} if sym == register else {miss}")
+    else:
+        lines.append(f"{indent}    a = {miss}")
+    return lines + _tree(
+        "a", list(range(none_id + 1)),
+        lambda key, ind: _action(actions[key] if key < none_id else None, state_ids, ind),
+        indent,
+    )
+
+
+def generate_source(table: TransitionTable, accept_state: str = "q_accept", reject_state: str = "q_reject") -> str:
+    """Исходный текст модуля для таблицы."""
+    if not table.is_deterministic():
+        raise ValueError("Генерация кода поддерживает только детерминированные таблицы.")
+    states = [accept_state, reject_state]
+    for state, row in table.transitions.items():
+        states.append(state)
+        for symbol, trans in row.items():
+            if not isinstance(trans, tuple) or len(trans) < 3:
+                raise ValueError(f"Неверный переход ({state}, {symbol}): {trans!r} — ожидается (символ, направление, состояние)")
+            states.append(trans[2])
+    states = list(dict.fromkeys(states))
+    state_ids = {state: i for i, state in enumerate(states)}
+
+    constants = []
+    bodies = {}
+    for i, state in enumerate(states[2:], start=2):
+        bodies[i] = _state_body(table, state, state_ids, i, constants, "")
+
+    def leaf(key, indent):
+        return [indent + line if line else line for line in bodies[key]]
+
+    loop = _tree("state", list(range(2, len(states))), leaf, " " * 8) if len(states) > 2 else []
+    lines = [
+        f"# Сгенерировано tm/codegen.py (версия {GENERATOR_VERSION}) — не редактировать.",
+        f"# Таблица: {table_hash(table, accept_state, reject_state)}",
+        "",
+        f"STATES = {states!r}",
+        "STATE_IDS = {name: i for i, name in enumerate(STATES)}",
+        *constants,
+        "",
+        "",
+        "def run(cells, head, state, register, steps, max_steps, iterations, blank):",
+        '    """',
+        "    До iterations итераций цикла TuringMachine.run. Изменяет cells на месте.",
+        "    Возвращает (состояние, шаги, головка, регистр, ячеек добавлено слева, остановилась ли машина).",
+        '    """',
+        "    n = len(cells)",
+        "    shift = 0",
+        "    for _ in range(iterations):",
+        "        if state < 2:",
+        "            return state, steps, head, register, shift, True",
+        "        if steps >= max_steps:",
+        "            state = 1",
+        "            continue",
+        "        sym = cells[head]",
+        *loop,
+        "    return state, steps, head, register, shift, False",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+# ========================== КЭШ ==============================
+
+def _import_file(name: str, path: str):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _from_source(name: str, source: str):
+    import types
+    module = types.ModuleType(name)
+    exec(compile(source, f"<{name}>", "exec"), module.__dict__)
+    return module
+
+
+def _prune(directory: str):
+    """Удаляет давно не использованные модули, если их больше CACHE_MAX_FILES."""
+    try:
+        paths = [os.path.join(directory, name) for name in os.listdir(directory)
+                 if name.startswith("tm_generated_") and name.endswith(".py")]
+        if len(paths) <= CACHE_MAX_FILES:
+            return
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:len(paths) - CACHE_MAX_FILES]:
+            os.remove(path)
+            compiled = importlib.util.cache_from_source(path)
+            if os.path.exists(compiled):
+                os.remove(compiled)
+    except OSError:
+        pass  # файл уже удалил другой процесс
+
+
+def load_compiled(table: TransitionTable, accept_state: str = "q_accept", reject_state: str = "q_reject"):
+    """
+    Скомпилированный модуль для таблицы: из памяти процесса, с диска или генерируется заново.
+    Если каталог кэша недоступен для записи, модуль создаётся только в памяти.
+    None — таблицу скомпилировать нельзя, её выполняет интерпретатор.
+    """
+    known = _by_table.setdefault(table, {})
+    if (accept_state, reject_state) in known:
+        return known[(accept_state, reject_state)]
+    try:
+        digest = table_hash(table, accept_state, reject_state)
+    except (TypeError, ValueError):
+        digest = None  # таблицу нельзя сериализовать — проверит generate_source
+    module = _loaded.get(digest)
+    if module is not None:
+        known[(accept_state, reject_state)] = module
+        return module
+
+    module = None
+    if digest is not None:
+        module = _load_or_generate(table, accept_state, reject_state, digest)
+        if module is not None:
+            _loaded[digest] = module
+    known[(accept_state, reject_state)] = module
+    return module
+
+
+def _load_or_generate(table: TransitionTable, accept_state: str, reject_state: str, digest: str):
+    name = f"tm_generated_{digest[:16]}"
+    directory = cache_dir()
+    path = os.path.join(directory, name + ".py")
+    if os.path.exists(path):
+        try:
+            module = _import_file(name, path)
+            os.utime(path)  # отметка использования для вытеснения
+            return module
+        except (OSError, SyntaxError):
+            pass  # повреждённый файл — сгенерируем заново
+    try:
+        source = generate_source(table, accept_state, reject_state)
+    except ValueError:
+        # ошибку в таблице покажет интерпретатор, когда дойдёт до этого перехода
+        return None
+    try:
+        try:
+            os.makedirs(directory, exist_ok=True)
+            # запись через временный файл: параллельные процессы не увидят недописанный модуль
+            fd, tmp_path = tempfile.mkstemp(suffix=".py", dir=directory)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(source)
+            os.replace(tmp_path, path)
+            module = _import_file(name, path)
+        except OSError as e:
+            warnings.warn(f"tm.codegen: кэш {directory} недоступен ({e}), модуль создаётся в памяти")
+            return _from_source(name, source)
+    except SyntaxError as e:
+        warnings.warn(f"tm.codegen: сгенерированный код не компилируется ({e}), используется интерпретатор")
+        return None
+    _prune(directory)
+    return module
@@ -3,12 +3,28 @@ from datetime import datetime
 import os
 
 
-DB_PATH = os.path.join(os.path.dirname(__file__), "../turing.db")
+DB_PATH = os.environ.get("TM_DB_PATH") or os.path.join(os.path.dirname(__file__), "../turing.db")
+
+# Сколько секунд ждать, пока другой процесс (воркер веб-сервера) держит блокировку записи
+BUSY_TIMEOUT = 5.0
+
+
+def connect(path: str = None) -> sqlite3.Connection:
+    """
+    Соединение с базой, безопасное при нескольких процессах:
+    при занятой базе ждём до BUSY_TIMEOUT вместо ошибки «database is locked».
+    Режим WAL включается в init_db и сохраняется в самом файле.
+    """
+    conn = sqlite3.connect(path or DB_PATH, timeout=BUSY_TIMEOUT)
+    conn.execute("PRAGMA synchronous = NORMAL")
+    return conn
 
 
 def init_db():
-    """Создаёт таблицу, если её ещё нет."""
-    conn = sqlite3.connect(DB_PATH)
+    """Создаёт таблицу, если её ещё нет, и переводит базу в режим WAL."""
+    conn = connect()
+    # WAL: читатели не блокируют писателя и видят последнее зафиксированное состояние
+    conn.execute("PRAGMA journal_mode = WAL")
     cur = conn.cursor()
     cur.execute("""
         CREATE TABLE IF NOT EXISTS history (
@@ -25,7 +41,7 @@ def init_db():
 
 def save_result(word: str, is_palindrome: bool, steps_count: int):
     """Сохраняет результат проверки слова."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect()
     cur = conn.cursor()
     cur.execute(
         "INSERT INTO history (word, is_palindrome, steps_count, created_at) VALUES (?, ?, ?, ?)",
@@ -35,22 +51,47 @@ def save_result(word: str, is_palindrome: bool, steps_count: int):
     conn.close()
 
 
-def get_history(limit: int = 20):
-    """Возвращает последние N записей истории."""
-    conn = sqlite3.connect(DB_PATH)
+def get_history(limit: int = 20, since_id: int = None):
+    """
+    Возвращает последние N записей истории (новые первыми).
+    since_id — только записи, добавленные после записи с этим id:
+    клиент дописывает новые строки, не перечитывая всю историю.
+    """
+    conn = connect()
     cur = conn.cursor()
     cur.execute(
-        "SELECT word, is_palindrome, steps_count, created_at FROM history ORDER BY id DESC LIMIT ?",
-        (limit,)
+        "SELECT id, word, is_palindrome, steps_count, created_at FROM history "
+        "WHERE id > ? ORDER BY id DESC LIMIT ?",
+        (since_id or 0, limit)
     )
     rows = cur.fetchall()
     conn.close()
     return [
         {
-            "word": r[0],
-            "is_palindrome": bool(r[1]),
-            "steps": r[2],
-            "created_at": r[3]
+            "id": r[0],
+            "word": r[1],
+            "is_palindrome": bool(r[2]),
+            "steps": r[3],
+            "created_at": r[4]
         }
         for r in rows
     ]
+
+
+def history_id_range() -> tuple:
+    """
+    (id самой старой записи, id последней записи); (0, 0) — история пуста.
+    Записи удаляются только clear_history, поэтому смена первого id означает очистку.
+    """
+    conn = connect()
+    row = conn.execute("SELECT MIN(id), MAX(id) FROM history").fetchone()
+    conn.close()
+    return row[0] or 0, row[1] or 0
+
+
+def clear_history():
+    """Удаляет все записи истории."""
+    conn = connect()
+    conn.execute("DELETE FROM history")
+    conn.commit()
+    conn.close()
@@ -0,0 +1,265 @@
+# tm/nondeterministic.py
+"""
+Недетерминированная машина Тьюринга.
+
+В таблице переходов вместо одного действия можно указать список:
+    "q0": {"_any_": [("_any_", "R", "q0"), ("_any_", "R", "q_seek", "store")]}
+Слово принимается, если хотя бы одна ветвь вычисления приходит в accept_state.
+Ветвь, попавшая в reject_state или не нашедшая перехода, просто обрывается.
+
+Перебираются конфигурации (состояние, регистр, лента, головка):
+  - strategy="bfs" — поиск в ширину, находит самую короткую принимающую ветвь;
+  - strategy="iddfs" — поиск в глубину с итеративным углублением: хранит
+    только текущий путь и таблицу посещённых, которую при нехватке места
+    перестаёт пополнять, но продолжает искать.
+Одинаковые конфигурации отбрасываются по хэш-множеству: лента хранится
+без пустых ячеек по краям, поэтому конфигурации, отличающиеся только
+запасом пустых ячеек, совпадают. max_configs ограничивает память.
+
+Детерминированная таблица — частный случай: результат и step_count
+совпадают с TuringMachine.
+"""
+from .tape import MappedTape, Tape
+from .transitions import TransitionTable
+
+# Минимальная ширина фронта, при которой расширение уровня BFS отдаётся пулу процессов
+PARALLEL_MIN_FRONTIER = 2048
+
+
+def _normalize(cells: list, head: int, blank: str):
+    """Убирает пустые ячейки по краям ленты (слева — только до головки)."""
+    start = 0
+    while start < head and start < len(cells) and cells[start] == blank:
+        start += 1
+    end = len(cells)
+    while end > start and cells[end - 1] == blank:
+        end -= 1
+    return tuple(cells[start:end]), head - start
+
+
+def successors(table: TransitionTable, config: tuple, blank: str) -> list:
+    """Все конфигурации, в которые машина может перейти за один шаг."""
+    state, register, cells, head = config
+    symbol = cells[head] if head < len(cells) else blank
+    result = []
+    for trans in table.get_all(state, symbol, register):
+        write_sym, direction, new_state = trans[:3]
+        new_register = register
+        if len(trans) > 3:
+            if trans[3] != "store":
+                raise ValueError(f"Неизвестная операция с регистром: {trans[3]}")
+            new_register = symbol
+
+        new_cells = list(cells)
+        new_head = head
+        if write_sym != "_any_" and write_sym != symbol:
+            while head >= len(new_cells):
+                new_cells.append(blank)
+            new_cells[head] = write_sym
+        if direction == "L":
+            if head == 0:
+                new_cells.insert(0, blank)
+            else:
+                new_head = head - 1
+        elif direction == "R":
+            new_head = head + 1
+        elif direction != "S":
+            raise ValueError(f"Неизвестное направление движения: {direction}")
+
+        new_cells, new_head = _normalize(new_cells, new_head, blank)
+        result.append((new_state, new_register, new_cells, new_head))
+    return result
+
+
+# --- Расширение уровня BFS в пуле процессов ---
+
+_worker_table = None
+_worker_blank = None
+
+
+def _init_worker(table_dict: dict, symbol_classes: dict, blank: str):
+    global _worker_table, _worker_blank
+    _worker_table = TransitionTable.from_dict(table_dict, symbol_classes)
+    _worker_blank = blank
+
+
+def _expand_in_worker(configs: list) -> list:
+    return [successors(_worker_table, config, _worker_blank) for config in configs]
+
+
+class NondeterministicTuringMachine:
+    """
+    Интерфейс как у TuringMachine (load_tape, run, state, step_count, get_result),
+    но run() перебирает ветви вычисления. После run():
+      - step_count — длина найденной принимающей ветви, а если её нет — самой длинной
+        из просмотренных (переход в reject_state считается шагом, как в TuringMachine);
+      - configurations — сколько конфигураций было рассмотрено;
+      - complete — False, если поиск остановлен по max_steps или max_configs
+        и ответ «отвергнуто» не окончательный.
+    workers > 1 — уровни BFS шире PARALLEL_MIN_FRONTIER расширяются в пуле процессов.
+    """
+    def __init__(self, transitions: TransitionTable, start_state: str = "q0",
+                 accept_state: str = "q_accept", reject_state: str = "q_reject",
+                 blank: str = "⊔", strategy: str = "bfs", max_configs: int = 1_000_000,
+                 workers: int = 1):
+        if strategy not in ("bfs", "iddfs"):
+            raise ValueError(f"Неизвестная стратегия поиска: {strategy} (ожидается bfs или iddfs)")
+        self.transitions = transitions
+        self.start_state = start_state
+        self.accept_state = accept_state
+        self.reject_state = reject_state
+        self.blank = blank
+        self.strategy = strategy
+        self.max_configs = max_configs
+        self.workers = workers
+        self.max_steps = 100_000  # максимальная глубина ветви
+        self.word = ""
+        self.state = start_state
+        self.step_count = 0
+        self.configurations = 0
+        self.complete = True
+
+    def load_tape(self, input_str):
+        if isinstance(input_str, MappedTape):
+            # конфигурации хранят ленту целиком — файл пришлось бы полностью загрузить в память
+            raise ValueError("Недетерминированная таблица не поддерживает --mmap: ветви хранят копию всей ленты.")
+        self.word = str(input_str) if isinstance(input_str, Tape) else input_str
+        self.state = self.start_state
+        self.step_count = 0
+        self.configurations = 0
+        self.complete = True
+
+    def initial_config(self) -> tuple:
+        cells, head = _normalize(list(self.word), 0, self.blank)
+        return (self.start_state, None, cells, head)
+
+    def run(self, trace: list = None) -> bool:
+        """
+        Ищет принимающую ветвь. Возвращает True — accept, False — reject.
+        В trace (если передан) добавляется по строке на каждый уровень поиска.
+        """
+        start = self.initial_config()
+        if start[0] == self.accept_state:
+            return self._finish(True, 0, 1, True)
+        if start[0] == self.reject_state:
+            return self._finish(False, 0, 1, True)
+        if self.strategy == "bfs":
+            return self._bfs(start, trace)
+        return self._iddfs(start, trace)
+
+    def _finish(self, accepted: bool, depth: int, configurations: int, complete: bool) -> bool:
+        self.state = self.accept_state if accepted else self.reject_state
+        self.step_count = depth
+        self.configurations = configurations
+        self.complete = complete
+        return accepted
+
+    # ========================== ПОИСК В ШИРИНУ ==============================
+    def _bfs(self, start: tuple, trace: list = None) -> bool:
+        visited = {start}
+        frontier = [start]
+        depth = 0
+        deepest = 0
+        pool = None
+        try:
+            while frontier:
+                if depth >= self.max_steps:
+                    return self._finish(False, deepest, len(visited), False)
+                if self.workers > 1 and len(frontier) >= PARALLEL_MIN_FRONTIER:
+                    if pool is None:
+                        pool = self._make_pool()
+                    size = -(-len(frontier) // (self.workers * 4))
+                    chunks = [frontier[i:i + size] for i in range(0, len(frontier), size)]
+                    expanded = [succ for part in pool.map(_expand_in_worker, chunks) for succ in part]
+                else:
+                    expanded = [successors(self.transitions, config, self.blank) for config in frontier]
+
+                next_frontier = []
+                if any(expanded):
+                    deepest = depth + 1
+                for succs in expanded:
+                    for config in succs:
+                        if config[0] == self.accept_state:
+                            return self._finish(True, depth + 1, len(visited), True)
+                        if config[0] == self.reject_state or config in visited:
+                            continue
+                        if len(visited) >= self.max_configs:
+                            return self._finish(False, deepest, len(visited), False)
+                        visited.add(config)
+                        next_frontier.append(config)
+                frontier = next_frontier
+                depth += 1
+                if trace is not None:
+                    trace.append(f"Глубина {depth}: новых конфигураций {len(frontier)}, всего {len(visited)}")
+            return self._finish(False, deepest, len(visited), True)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def _make_pool(self):
+        from concurrent.futures import ProcessPoolExecutor
+        return ProcessPoolExecutor(
+            self.workers, initializer=_init_worker,
+            initargs=(self.transitions.to_dict(), self.transitions.symbol_classes, self.blank),
+        )
+
+    # ========================== ИТЕРАТИВНОЕ УГЛУБЛЕНИЕ ==============================
+    def _iddfs(self, start: tuple, trace: list = None) -> bool:
+        explored = 0
+        deepest = 0
+        for limit in range(1, self.max_steps + 1):
+            found, cut, count, deepest = self._depth_limited(start, limit)
+            explored += count
+            if trace is not None:
+                trace.append(f"Предел глубины {limit}: рассмотрено конфигураций {count}")
+            if found is not None:
+                return self._finish(True, found, explored, True)
+            if not cut:
+                # ни одна ветвь не упёрлась в предел — перебраны все конфигурации
+                return self._finish(False, deepest, explored, True)
+        return self._finish(False, deepest, explored, False)
+
+    def _depth_limited(self, start: tuple, limit: int):
+        """
+        Поиск в глубину до глубины limit. Возвращает (глубина принятия или None,
+        была ли обрезана хотя бы одна ветвь, число рассмотренных конфигураций,
+        длина самой длинной ветви).
+        """
+        # конфигурация → наибольший запас глубины, с которым её уже обошли
+        best = {}
+        stack = [(start, 0)]
+        cut = False
+        count = 0
+        deepest = 0
+        while stack:
+            config, depth = stack.pop()
+            remaining = limit - depth
+            if best.get(config, -1) >= remaining:
+                continue
+            if config in best or len(best) < self.max_configs:
+                best[config] = remaining
+            count += 1
+            succs = successors(self.transitions, config, self.blank)
+            if remaining == 0:
+                deepest = max(deepest, depth + any(s[0] == self.reject_state for s in succs))
+                if any(succ[0] != self.reject_state for succ in succs):
+                    cut = True
+                continue
+            if succs:
+                deepest = max(deepest, depth + 1)
+            for succ in succs:
+                if succ[0] == self.accept_state:
+                    return depth + 1, cut, count, deepest
+                if succ[0] != self.reject_state:
+                    stack.append((succ, depth + 1))
+        return None, cut, count, deepest
+
+    def is_halted(self) -> bool:
+        return self.state in (self.accept_state, self.reject_state)
+
+    def get_result(self) -> str:
+        if self.state == self.accept_state:
+            return "Слово принято"
+        if not self.complete:
+            return "Принимающая ветвь не найдена (поиск остановлен по лимиту)"
+        return "Слово отвергнуто: ни одна ветвь не приходит в принимающее состояние"
@@ -0,0 +1,193 @@
+# tm/optimize.py
+"""
+Оптимизация таблицы переходов без изменения поведения машины.
+
+minimize_table() выполняет:
+  - удаление состояний, недостижимых из начального;
+  - слияние эквивалентных состояний (разбиение Мура: одинаковые действия
+    на каждом символе с переходом в эквивалентные состояния);
+  - сжатие алфавита: символы, ведущие себя одинаково во всех состояниях,
+    объединяются в класс (TransitionTable.symbol_classes), а записи,
+    совпадающие с '_any_', удаляются.
+
+Результат на любом входе совпадает с исходной таблицей, включая step_count.
+"""
+from .transitions import TransitionTable
+
+
+# Условное обозначение «любого другого символа» — того, что попадает в '_any_'
+OTHER = "_any_"
+# Переход при совпадении символа с регистром машины
+REG = "_reg_"
+
+
+def table_size(table: TransitionTable) -> dict:
+    """Размеры таблицы: число состояний, записей и различных ключей-символов (класс считается одним)."""
+    symbols = {symbol for row in table.transitions.values() for symbol in row if symbol not in (OTHER, REG)}
+    return {
+        "states": len(table.transitions),
+        "entries": sum(len(row) for row in table.transitions.values()),
+        "symbols": len(symbols),
+    }
+
+
+def _reachable(table: TransitionTable, start_state: str) -> list:
+    order = [start_state]
+    seen = {start_state}
+    for state in order:
+        for trans in table.transitions.get(state, {}).values():
+            if trans[2] not in seen:
+                seen.add(trans[2])
+                order.append(trans[2])
+    return order
+
+
+def _normalize(symbol: str, trans):
+    """Запись того же символа, что прочитан, эквивалентна '_any_' (ничего не меняем)."""
+    if trans is None:
+        return None
+    if trans[0] == symbol:
+        return ("_any_",) + tuple(trans[1:])
+    return tuple(trans)
+
+
+def minimize_table(table: TransitionTable, start_state: str = "q0",
+                   accept_state: str = "q_accept", reject_state: str = "q_reject"):
+    """
+    Возвращает (новая таблица, отчёт). Отчёт содержит размеры до и после,
+    число удалённых недостижимых состояний, слитых состояний и классов символов.
+    """
+    if not table.is_deterministic():
+        raise ValueError("Минимизация поддерживает только детерминированные таблицы.")
+    before = table_size(table)
+    halting = {accept_state, reject_state}
+
+    reachable = _reachable(table, start_state)
+    states = [s for s in reachable if s not in halting]
+    unreachable = len([s for s in table.transitions if s not in set(reachable) | halting])
+
+    # алфавит — все символы, явно упомянутые в достижимых состояниях (классы раскрываются)
+    class_members = {}
+    for symbol, symbol_class in table.symbol_classes.items():
+        class_members.setdefault(symbol_class, []).append(symbol)
+    symbols = []
+    for state in states:
+        for symbol in table.transitions.get(state, {}):
+            if symbol not in (OTHER, REG):
+                symbols.extend(class_members.get(symbol, [symbol]))
+    symbols = list(dict.fromkeys(symbols))
+
+    def action(state, symbol):
+        """
+        Действие на символе. В состояниях с "_reg_" важно и то, задан ли символ явно:
+        явный переход перекрывает "_reg_", поэтому его нельзя заменить на "_any_".
+        """
+        row = table.transitions.get(state, {})
+        explicit = None
+        if REG in row:
+            explicit = symbol in row or table.symbol_classes.get(symbol) in row
+        return (_normalize(symbol, table.get(state, symbol)), explicit)
+
+    def special(state, key):
+        row = table.transitions.get(state, {})
+        return (_normalize(None, row.get(key)), False if REG in row else None)
+
+    # столбцы: символы алфавита, затем '_any_' и '_reg_'
+    actions = {
+        state: [action(state, symbol) for symbol in symbols] + [special(state, OTHER), special(state, REG)]
+        for state in states
+    }
+
+    # --- слияние эквивалентных состояний ---
+    block = {accept_state: 0, reject_state: 1}
+    block.update({state: 2 for state in states})
+    count = len(set(block.values()))
+    while True:
+        signatures = {}
+        new_block = {accept_state: 0, reject_state: 1}
+        for state in states:
+            signature = (block[state], tuple(
+                (None if a is None else a[:2] + (block[a[2]],) + a[3:], explicit)
+                for a, explicit in actions[state]
+            ))
+            new_block[state] = signatures.setdefault(signature, len(signatures) + 2)
+        new_count = len(set(new_block.values()))
+        block = new_block
+        if new_count == count:
+            break
+        count = new_count
+
+    representative = {0: accept_state, 1: reject_state}
+    for state in [start_state] + states:
+        if state in block:
+            representative.setdefault(block[state], state)
+
+    def rename(column):
+        a, explicit = column
+        if a is None:
+            return column
+        return (a[:2] + (representative[block[a[2]]],) + a[3:], explicit)
+
+    kept = [s for s in states if representative[block[s]] == s]
+    renamed = {state: [rename(column) for column in actions[state]] for state in kept}
+
+    # --- классы символов с одинаковым поведением во всех состояниях ---
+    other_column = tuple(renamed[state][-2] for state in kept)
+    groups = {}
+    for i, symbol in enumerate(symbols):
+        column = tuple(renamed[state][i] for state in kept)
+        if column == other_column:
+            continue  # символ полностью обрабатывается '_any_'
+        groups.setdefault(column, []).append((i, symbol))
+
+    symbol_classes = {}
+    keys = []  # (ключ в таблице, индекс столбца-представителя)
+    for n, members in enumerate(groups.values()):
+        if len(members) == 1:
+            keys.append((members[0][1], members[0][0]))
+            continue
+        class_name = f"_cls{n}_"
+        for _, symbol in members:
+            symbol_classes[symbol] = class_name
+        keys.append((class_name, members[0][0]))
+
+    t = {}
+    for state in kept:
+        row = {}
+        other, _ = renamed[state][-2]
+        reg, _ = renamed[state][-1]
+        for key, i in keys:
+            a, explicit = renamed[state][i]
+            # в состояниях с "_reg_" сохраняем ровно явные переходы, иначе — отличные от '_any_'
+            needed = explicit if explicit is not None else a != other
+            if a is not None and needed:
+                row[key] = a
+        if reg is not None:
+            row[REG] = reg
+        if other is not None:
+            row[OTHER] = other
+        t[state] = row
+    t[accept_state] = {}
+    t[reject_state] = {}
+
+    optimized = TransitionTable(t, symbol_classes)
+    report = {
+        "before": before,
+        "after": table_size(optimized),
+        "unreachable_removed": unreachable,
+        "states_merged": len(states) - len(kept),
+        "symbol_classes": len(set(symbol_classes.values())),
+    }
+    return optimized, report
+
+
+def format_report(report: dict) -> str:
+    before, after = report["before"], report["after"]
+    return (
+        f"Состояний: {before['states']} → {after['states']}, "
+        f"записей: {before['entries']} → {after['entries']}, "
+        f"символов: {before['symbols']} → {after['symbols']} "
+        f"(недостижимых удалено: {report['unreachable_removed']}, "
+        f"слито состояний: {report['states_merged']}, "
+        f"классов символов: {report['symbol_classes']})"
+    )
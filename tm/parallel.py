@@ -0,0 +1,113 @@
+# tm/parallel.py
+"""
+Параллельная проверка палиндрома для больших входов.
+
+Машина Тьюринга сверяет пары символов (i, n-1-i) строго по очереди, поэтому
+одно большое слово выполняется на одном ядре за O(n²) шагов. Здесь те же пары
+разбиваются на зеркальные куски [start, stop) ↔ [n-stop, n-start), которые
+проверяются в отдельных процессах. Вход копируется один раз в общую память
+(multiprocessing.shared_memory), процессы читают его без пересылки.
+
+Вердикт и число шагов совпадают с TransitionTable.palindrome_table():
+  - палиндром длины n — (n + 1)² шагов;
+  - первое несовпадение в паре m — (n + 2) + (2n + 3)·m шагов.
+"""
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+
+# Символы, которые машина трактует особо (пометка и пустая ячейка)
+RESERVED = ("X", "⊔")
+DEFAULT_CHUNK = 1 << 20
+
+
+def palindrome_steps(n: int, mismatch: int = None) -> int:
+    """Число шагов машины palindrome_table на слове длины n."""
+    if mismatch is None:
+        return (n + 1) ** 2
+    return (n + 2) + (2 * n + 3) * mismatch
+
+
+def _as_buffer(data):
+    """bytes/bytearray/mmap — по байту на ячейку; str — по 4 байта (UTF-32) на символ."""
+    if isinstance(data, str):
+        if any(ch in data for ch in RESERVED):
+            raise ValueError("Вход содержит служебные символы машины (X или ⊔).")
+        return array("I", data.encode("utf-32-le")), 4
+    if data.find(b"X") != -1:
+        raise ValueError("Вход содержит служебный символ машины X.")
+    return data, 1
+
+
+def _first_mismatch(buf, n: int, start: int, stop: int, itemsize: int) -> int:
+    """Первая пара i в [start, stop), где buf[i] != buf[n-1-i], или -1."""
+    if itemsize == 4:
+        cells = memoryview(buf).cast("B").cast("I")
+    else:
+        cells = memoryview(buf).cast("B")
+    left = cells[start:stop]
+    right = cells[n - stop:n - start]
+    if left.tobytes() == right[::-1].tobytes():
+        return -1
+    for offset in range(stop - start):
+        if left[offset] != right[len(right) - 1 - offset]:
+            return start + offset
+    return -1
+
+
+def _check_chunk(shm_name: str, n: int, start: int, stop: int, itemsize: int) -> int:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        return _first_mismatch(shm.buf[:n * itemsize], n, start, stop, itemsize)
+    finally:
+        shm.close()
+
+
+def verify_palindrome(data, workers: int = None, chunk_size: int = DEFAULT_CHUNK) -> dict:
+    """
+    Проверяет палиндром по зеркальным кускам в нескольких процессах.
+    data — bytes/bytearray/mmap (символ = байт) или str.
+    Возвращает {"accepted", "steps", "mismatch"}: mismatch — номер первой
+    несовпавшей пары (None для палиндрома), steps — эквивалентное число шагов машины.
+    """
+    buf, itemsize = _as_buffer(data)
+    n = len(buf)
+    half = n // 2
+    bounds = [(start, min(start + chunk_size, half)) for start in range(0, half, chunk_size)]
+    workers = workers or os.cpu_count() or 1
+
+    if workers <= 1 or len(bounds) <= 1:
+        mismatches = [_first_mismatch(buf, n, start, stop, itemsize) for start, stop in bounds]
+    else:
+        mismatches = _parallel_mismatches(buf, n, bounds, itemsize, workers)
+
+    found = [m for m in mismatches if m >= 0]
+    mismatch = min(found) if found else None
+    return {
+        "accepted": mismatch is None,
+        "steps": palindrome_steps(n, mismatch),
+        "mismatch": mismatch,
+    }
+
+
+def _parallel_mismatches(buf, n: int, bounds: list, itemsize: int, workers: int) -> list:
+    shm = shared_memory.SharedMemory(create=True, size=max(1, n * itemsize))
+    try:
+        shm.buf[:n * itemsize] = memoryview(buf).cast("B")
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(_check_chunk, shm.name, n, start, stop, itemsize) for start, stop in bounds]
+            results = []
+            for i, future in enumerate(futures):
+                result = future.result()
+                results.append(result)
+                if result >= 0:
+                    # куски идут по возрастанию: дальше несовпадение будет только правее
+                    for rest in futures[i + 1:]:
+                        rest.cancel()
+                    break
+            return results
+    finally:
+        shm.close()
+        shm.unlink()
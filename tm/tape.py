@@ -9,6 +9,8 @@ class Tape:
         # Если пустая входная строка — создаём одну ячейку с blank,
         # чтобы чтение/запись работали корректно.
         self.cells = list(input_str) if input_str else [self.blank]
+        # сколько пустых ячеек было добавлено слева (сдвиг индексов относительно входа)
+        self.offset = 0
 
     def read(self, pos: int) -> str:
         if pos < 0:
@@ -32,6 +34,11 @@ class Tape:
         while pos >= len(self.cells):
             self.cells.append(self.blank)
 
+    def extend_left(self):
+        """Добавляет пустую ячейку слева; все индексы сдвигаются на 1 вправо."""
+        self.cells.insert(0, self.blank)
+        self.offset += 1
+
     def __len__(self):
         return len(self.cells)
 
@@ -43,3 +50,82 @@ class Tape:
 
     def __repr__(self):
         return f"<Tape {''.join(self.cells)}>"
+
+
+class MappedTape(Tape):
+    """
+    Лента только для чтения поверх bytes/mmap без копирования входа.
+
+    Каждый байт входа — одна ячейка; символ получается через однобайтовую
+    кодировку (latin-1, cp1251 для кириллицы и т.п.). Исходные данные
+    не изменяются: записанные машиной ячейки хранятся в разреженном
+    словаре self.overlay (copy-on-write), поэтому память растёт только
+    с количеством затронутых ячеек.
+    """
+    def __init__(self, data=b"", blank: str = "⊔", encoding: str = "latin-1"):
+        if any(len(ch.encode(encoding, errors="replace")) != 1 for ch in "яé"):
+            raise ValueError(f"Кодировка {encoding} не однобайтовая — используйте, например, latin-1 или cp1251.")
+        self.blank = blank
+        self.encoding = encoding
+        self.data = data
+        # таблица байт → символ, чтобы не декодировать каждую ячейку отдельно
+        self._chars = bytes(range(256)).decode(encoding, errors="replace")
+        self.overlay = {}
+        # сколько пустых ячеек было добавлено слева (сдвиг индексов относительно data)
+        self.offset = 0
+        self.length = len(data) if len(data) else 1
+
+    @classmethod
+    def from_file(cls, f, blank: str = "⊔", encoding: str = "latin-1"):
+        """Отображает открытый на чтение файл в память (mmap) и оборачивает его лентой."""
+        import mmap
+        import os
+        if os.fstat(f.fileno()).st_size == 0:
+            return cls(b"", blank=blank, encoding=encoding)
+        return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), blank=blank, encoding=encoding)
+
+    def read(self, pos: int) -> str:
+        if pos < 0 or pos >= self.length:
+            return self.blank
+        base = pos - self.offset
+        symbol = self.overlay.get(base)
+        if symbol is not None:
+            return symbol
+        if 0 <= base < len(self.data):
+            return self._chars[self.data[base]]
+        return self.blank
+
+    def write(self, pos: int, symbol: str):
+        if pos < 0:
+            raise IndexError("Запись в отрицательный индекс не поддерживается напрямую.")
+        self.ensure_index(pos)
+        base = pos - self.offset
+        # запись того же символа не создаёт копию ячейки
+        if base not in self.overlay and self.read(pos) == symbol:
+            return
+        self.overlay[base] = symbol
+
+    def ensure_index(self, pos: int):
+        if pos >= self.length:
+            self.length = pos + 1
+
+    def extend_left(self):
+        self.offset += 1
+        self.length += 1
+
+    @property
+    def cells(self):
+        """Материализует ленту в список (только для небольших лент и отображения)."""
+        return [self.read(i) for i in range(self.length)]
+
+    def __len__(self):
+        return self.length
+
+    def __bool__(self):
+        return self.length > 0
+
+    def __str__(self):
+        return ''.join(self.cells)
+
+    def __repr__(self):
+        return f"<MappedTape len={self.length} touched={len(self.overlay)}>"
@@ -1,16 +1,77 @@
 class TransitionTable:
-    def __init__(self, transitions: dict):
+    """
+    Таблица переходов: {состояние: {символ: (запись, движение, новое состояние[, операция])}}.
+
+    Специальные ключи символа:
+      - "_any_" — любой символ, для которого нет более точного перехода;
+      - "_reg_" — текущий символ совпадает с запомненным в регистре машины.
+    Четвёртый элемент перехода "store" запоминает прочитанный символ в регистре.
+    Регистр позволяет сравнивать произвольные символы Unicode таблицей
+    фиксированного размера, не заводя состояния под каждую букву алфавита.
+
+    Вместо одного перехода можно указать список переходов — такую
+    (недетерминированную) таблицу выполняет NondeterministicTuringMachine.
+    """
+    def __init__(self, transitions: dict, symbol_classes: dict = None):
         self.transitions = transitions or {}
+        # символ → имя класса эквивалентности; переход по классу ищется после точного символа
+        self.symbol_classes = symbol_classes or {}
 
-    def get(self, state: str, symbol: str):
+    def get(self, state: str, symbol: str, register: str = None):
         if state in self.transitions:
             state_transitions = self.transitions[state]
             if symbol in state_transitions:
                 return state_transitions[symbol]
+            if self.symbol_classes:
+                symbol_class = self.symbol_classes.get(symbol)
+                if symbol_class in state_transitions:
+                    return state_transitions[symbol_class]
+            if register is not None and symbol == register and "_reg_" in state_transitions:
+                return state_transitions["_reg_"]
             if "_any_" in state_transitions:
                 return state_transitions["_any_"]
         return None
 
+    def get_all(self, state: str, symbol: str, register: str = None) -> list:
+        """Все возможные переходы (для недетерминированной таблицы их может быть несколько)."""
+        trans = self.get(state, symbol, register)
+        if trans is None:
+            return []
+        return trans if isinstance(trans, list) else [trans]
+
+    def is_deterministic(self) -> bool:
+        return not any(isinstance(trans, list) for row in self.transitions.values() for trans in row.values())
+
+    @staticmethod
+    def from_dict(transitions: dict, symbol_classes: dict = None):
+        """
+        Строит таблицу из словаря, загруженного из JSON:
+        {"q0": {"a": ["b", "R", "q1"], ...}, ...} — списки превращаются в кортежи.
+        Список списков — несколько переходов недетерминированной таблицы:
+        {"q0": {"a": [["a", "R", "q0"], ["b", "R", "q1"]]}}.
+        """
+        def convert(trans):
+            if trans and isinstance(trans[0], list):
+                return [tuple(t) for t in trans]
+            return tuple(trans)
+
+        return TransitionTable({
+            state: {symbol: convert(trans) for symbol, trans in row.items()}
+            for state, row in transitions.items()
+        }, symbol_classes)
+
+    def to_dict(self) -> dict:
+        """Обратное преобразование для сохранения таблицы в JSON."""
+        def convert(trans):
+            if isinstance(trans, list):
+                return [list(t) for t in trans]
+            return list(trans)
+
+        return {
+            state: {symbol: convert(trans) for symbol, trans in row.items()}
+            for state, row in self.transitions.items()
+        }
+
     def __contains__(self, state: str):
         return state in self.transitions
 
@@ -62,3 +123,90 @@ class TransitionTable:
         t["q_reject"] = {}
 
         return TransitionTable(t)
+
+    @staticmethod
+    def palindrome_table():
+        """
+        Проверка палиндрома для любого алфавита Unicode.
+        Вместо состояний q_mark_<буква>/q_check_<буква> первая буква запоминается
+        в регистре ("store") и сравнивается с последней через ключ "_reg_".
+        Размер таблицы не зависит от алфавита; число шагов совпадает со strict_palindrome_table.
+        """
+        t = {
+            "q0": {
+                "X": ("X", "R", "q0"),
+                "⊔": ("⊔", "S", "q_accept"),
+                "_any_": ("X", "R", "q_mark", "store"),
+            },
+            # идём к правому краю
+            "q_mark": {
+                "X": ("X", "R", "q_mark"),
+                "⊔": ("⊔", "L", "q_check"),
+                "_any_": ("_any_", "R", "q_mark"),
+            },
+            # сверяем крайний правый неотмеченный символ с запомненным
+            "q_check": {
+                "X": ("X", "L", "q_check"),
+                "⊔": ("⊔", "S", "q_accept"),
+                "_reg_": ("X", "L", "q_back"),
+                "_any_": ("_any_", "S", "q_reject"),
+            },
+            # возврат в начало
+            "q_back": {
+                "X": ("X", "L", "q_back"),
+                "_any_": ("_any_", "L", "q_back"),
+                "⊔": ("⊔", "R", "q0"),
+            },
+            "q_accept": {},
+            "q_reject": {},
+        }
+        return TransitionTable(t)
+
+
+    @staticmethod
+    def repeated_symbol_table():
+        """
+        Недетерминированная таблица: есть ли в слове повторяющийся символ.
+        Машина «угадывает» первое вхождение (запоминает его в регистре)
+        и затем второе — всего два состояния для любого алфавита.
+        """
+        t = {
+            "q0": {
+                "⊔": ("⊔", "S", "q_reject"),
+                "_any_": [
+                    ("_any_", "R", "q0"),
+                    ("_any_", "R", "q_seek", "store"),
+                ],
+            },
+            "q_seek": {
+                "⊔": ("⊔", "S", "q_reject"),
+                "_reg_": ("_any_", "S", "q_accept"),
+                "_any_": ("_any_", "R", "q_seek"),
+            },
+            "q_accept": {},
+            "q_reject": {},
+        }
+        return TransitionTable(t)
+
+
+# Именованные таблицы, доступные по имени (например, из командной строки)
+TABLES = {
+    "palindrome": TransitionTable.palindrome_table,
+    "strict_palindrome": TransitionTable.strict_palindrome_table,
+    "repeated_symbol": TransitionTable.repeated_symbol_table,
+}
+
+_table_cache = {}
+
+
+def get_table(name: str = "palindrome") -> TransitionTable:
+    """
+    Возвращает именованную таблицу, строя её при первом обращении.
+    Таблица общая для всех вызовов — её нельзя изменять.
+    """
+    table = _table_cache.get(name)
+    if table is None:
+        if name not in TABLES:
+            raise KeyError(f"Неизвестная таблица: {name}")
+        table = _table_cache[name] = TABLES[name]()
+    return table
@@ -1,6 +1,8 @@
 # tm/turing_machine.py
+import os
+
 from .tape import Tape
-from .transitions import TransitionTable
+from .transitions import TransitionTable, get_table
 
 class TuringMachine:
     """
@@ -8,17 +10,23 @@ class TuringMachine:
     Конструктор гибкий:
       - если first_arg — TransitionTable, то используется он и состояния берутся из аргументов start_state/accept_state/reject_state
       - если first_arg — строка, то считается входной словом и используется default_palindrome_table()
+    run() без trace выполняет сгенерированный по таблице код (tm/codegen.py),
+    если use_codegen включён (TM_CODEGEN=0 отключает его для всех машин).
     """
+    use_codegen = os.environ.get("TM_CODEGEN", "1") != "0"
+
     def __init__(self, first_arg=None, start_state: str = "q0",
                  accept_state: str = "q_accept", reject_state: str = "q_reject",
                  blank: str = "⊔"):
         # если передали таблицу переходов
         if isinstance(first_arg, TransitionTable):
+            if not first_arg.is_deterministic():
+                raise ValueError("Таблица недетерминированная — используйте NondeterministicTuringMachine.")
             self.transitions = first_arg
             self.tape = Tape("", blank=blank)
         else:
             # иначе — первый аргумент может быть входной строкой
-            self.transitions = TransitionTable.strict_palindrome_table()
+            self.transitions = get_table("palindrome")
             self.tape = Tape(first_arg if isinstance(first_arg, str) else "", blank=blank)
 
         self.head = 0
@@ -29,12 +37,16 @@ class TuringMachine:
         self.blank = blank
         self.step_count = 0
         self.max_steps = 100_000  # защита от бесконечных циклов
+        self.register = None  # запомненный символ для переходов "_reg_"
+        self._compiled = None  # (таблица, сгенерированный модуль)
 
-    def load_tape(self, input_str: str):
-        self.tape = Tape(input_str, blank=self.blank)
+    def load_tape(self, input_str):
+        """Загружает слово на ленту. Можно передать готовую ленту (например, MappedTape)."""
+        self.tape = input_str if isinstance(input_str, Tape) else Tape(input_str, blank=self.blank)
         self.head = 0
         self.state = self.start_state
         self.step_count = 0
+        self.register = None
 
     def read_symbol(self):
         return self.tape.read(self.head)
@@ -51,7 +63,7 @@ class TuringMachine:
         if direction == "L":
             if self.head == 0:
                 # если идём за левую границу — вставим blank в начало и оставим голову на 0
-                self.tape.cells.insert(0, self.blank)
+                self.tape.extend_left()
                 # head остаётся 0 (мы как бы добавили ячейку слева)
             else:
                 self.head -= 1
@@ -77,7 +89,7 @@ class TuringMachine:
             return "Превышен лимит шагов — остановлено."
 
         cur_symbol = self.read_symbol()
-        trans = self.transitions.get(self.state, cur_symbol)
+        trans = self.transitions.get(self.state, cur_symbol, self.register)
 
         # Поддержка wildcard: если у таблицы есть '_any_' — transitions.get уже вернёт его.
         if trans is None:
@@ -85,7 +97,11 @@ class TuringMachine:
             self.state = self.reject_state
             return f"Нет перехода для ({self.state}, {cur_symbol}) — отклонено."
 
-        write_sym, direction, new_state = trans
+        write_sym, direction, new_state = trans[:3]
+        if len(trans) > 3:
+            if trans[3] != "store":
+                raise ValueError(f"Неизвестная операция с регистром: {trans[3]}")
+            self.register = cur_symbol
 
         # если write_sym == "_any_" — записываем текущий символ (ничего не меняем)
         if write_sym != "_any_":
@@ -108,20 +124,66 @@ class TuringMachine:
 
         return action
 
-    def run(self):
+    def run(self, trace: list = None):
         """
         Запустить до остановки (accept/reject) или до max_steps.
         Возвращает итоговый результат (True — accept, False — reject).
+        Если передан список trace, в него добавляются описания всех шагов.
         """
-    
+        if trace is None and self.use_codegen and type(self.tape) is Tape:
+            compiled = self._compiled_table()
+            if compiled is not None and self.state in compiled.STATE_IDS:
+                if self._run_compiled(compiled, self.max_steps):
+                    return self.state == self.accept_state
+                # Превышен лимит
+                self.state = self.reject_state
+                return False
+
         for _ in range(self.max_steps):
             if self.is_halted():
                 return self.state == self.accept_state
-            self.step()
+            action = self.step()
+            if trace is not None:
+                trace.append(action)
         # Превышен лимит
         self.state = self.reject_state  
         return False
 
+    def _compiled_table(self):
+        """Сгенерированный модуль для таблицы; None — таблицу выполняет интерпретатор."""
+        if self._compiled is None or self._compiled[0] is not self.transitions:
+            from .codegen import load_compiled
+            self._compiled = (self.transitions, load_compiled(self.transitions, self.accept_state, self.reject_state))
+        return self._compiled[1]
+
+    def _run_compiled(self, compiled, iterations: int) -> bool:
+        """До iterations итераций цикла run() сгенерированной функцией. Возвращает, остановилась ли машина."""
+        tape = self.tape
+        state, self.step_count, self.head, self.register, shift, halted = compiled.run(
+            tape.cells, self.head, compiled.STATE_IDS[self.state], self.register,
+            self.step_count, self.max_steps, iterations, tape.blank,
+        )
+        tape.offset += shift
+        self.state = compiled.STATES[state]
+        return halted
+
+    def advance(self, n: int) -> bool:
+        """
+        Выполнить до n шагов без описаний действий (перемотка).
+        В отличие от run(), исчерпание n не отклоняет слово.
+        Возвращает True, если машина остановилась.
+        """
+        if self.use_codegen and type(self.tape) is Tape:
+            compiled = self._compiled_table()
+            if compiled is not None and self.state in compiled.STATE_IDS:
+                self._run_compiled(compiled, n)
+                return self.is_halted()
+        for _ in range(n):
+            if self.is_halted():
+                break
+            self.step()
+        return self.is_halted()
+
     def is_halted(self) -> bool:
         return self.state in (self.accept_state, self.reject_state)
 
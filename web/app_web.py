@@ -1,17 +1,86 @@
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse, HTMLResponse
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager, suppress
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, HTMLResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
-from tm.database import init_db, save_result, get_history
-from tm.turing_machine import TuringMachine, TransitionTable
+from tm.database import init_db, save_result, get_history, clear_history as clear_history_db
+from web.cache import ResultCache
+from web.coalesce import SingleFlight
+from web.history_feed import HistoryFeed
+from web.sessions import SessionStore
+from web.trace import BINARY_MEDIA_TYPE, CHECK_MAX_STEPS, Trace, choose_encoding, simulate
 import traceback
 
+# --- Объединение одинаковых одновременных проверок (в пределах воркера) ---
+check_flight = SingleFlight()
+# --- Кэш результатов, общий для всех воркеров ---
+result_cache = ResultCache()
+
+
+def compute_trace(word: str):
+    """
+    Симуляция — выполняется один раз на группу одинаковых одновременных запросов.
+    Если слово уже посчитал любой воркер, трасса берётся из общего кэша.
+    """
+    key = ResultCache.make_key("palindrome", word, CHECK_MAX_STEPS)
+    data = result_cache.get(key)
+    if data is not None:
+        return Trace.from_data(data)
+    trace = simulate(word)
+    result_cache.put(key, trace.to_data())
+    return trace
+
+
+def trace_response(request: Request, trace) -> Response:
+    """
+    Ответ с трассой в формате, запрошенном в Accept (JSON или application/x-tm-trace),
+    сжатый согласно Accept-Encoding.
+    """
+    binary = BINARY_MEDIA_TYPE in request.headers.get("accept", "")
+    body = trace.encoded(binary)
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""), len(body))
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if encoding:
+        body = trace.encoded(binary, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type=BINARY_MEDIA_TYPE if binary else "application/json", headers=headers)
+
+
+# --- Лента новых записей истории (SSE) ---
+history_feed = HistoryFeed()
+HISTORY_LIMIT = 20
+SSE_KEEPALIVE = 15.0  # секунд без событий до служебного комментария
+
+
+# --- Интерактивные WebSocket-сессии ---
+sessions = SessionStore(ttl=600)
+RUN_CHUNK = 200  # шагов в одном сообщении при безостановочном выполнении
+
+
+async def evict_sessions_periodically(interval: float = 60.0):
+    while True:
+        await asyncio.sleep(interval)
+        sessions.evict_expired()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Инициализация базы данных при старте сервера, а не при импорте модуля."""
+    init_db()
+    evictor = asyncio.create_task(evict_sessions_periodically())
+    yield
+    await history_feed.stop()
+    evictor.cancel()
+    with suppress(asyncio.CancelledError):
+        await evictor
+
+
 # --- Инициализация приложения ---
-app = FastAPI(title="Машина Тьюринга — Палиндром")
+app = FastAPI(title="Машина Тьюринга — Палиндром", lifespan=lifespan)
 templates = Jinja2Templates(directory="web/templates")
 
-# --- Инициализация базы данных при старте ---
-init_db()
-
 
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
@@ -26,6 +95,7 @@ async def check_word(request: Request):
     """
     Проверка слова на палиндром.
     Принимает JSON {"word": "..."} и возвращает пошаговую симуляцию.
+    При Accept: application/x-tm-trace трасса отдаётся в компактном двоичном формате.
     Также сохраняет результат в базу данных.
     """
     data = await request.json()
@@ -35,50 +105,13 @@ async def check_word(request: Request):
         return JSONResponse({"error": "Введите слово для проверки!"}, status_code=400)
 
     try:
-        # Создаём таблицу переходов и машину Тьюринга
-        table = TransitionTable.strict_palindrome_table()
-        machine = TuringMachine(table)
-        machine.load_tape(word)
-
-        steps = []
-        max_steps = 500
-        step_count = 0
-
-        while not machine.is_halted() and step_count < max_steps:
-            tape_str = "".join(machine.tape.cells)
-            current_symbol = machine.read_symbol()
-
-            # Выполняем один шаг
-            action_text = machine.step()
-
-            # Формируем понятное описание шага
-            human_action = f"Машина считывает символ «{current_symbol}». {action_text}."
-            if "влево" in action_text:
-                human_action += " Головка движется влево."
-            elif "вправо" in action_text:
-                human_action += " Головка движется вправо."
-            elif "остались" in action_text:
-                human_action += " Головка остаётся на месте."
-
-            steps.append({
-                "tape": tape_str,
-                "head": machine.head,
-                "state": machine.state,
-                "action": human_action
-            })
-            step_count += 1
-
-        result = machine.get_result()
-        is_palindrome = machine.state == machine.accept_state
-
-        # Сохраняем результат в базу данных
-        save_result(word, is_palindrome, len(steps))
-
-        return JSONResponse({
-            "is_palindrome": is_palindrome,
-            "result": result,
-            "steps": steps
-        })
+        # Одновременные запросы одного и того же слова считаются один раз
+        key = ("palindrome", word, CHECK_MAX_STEPS)
+        trace = await check_flight.do(key, lambda: asyncio.to_thread(compute_trace, word))
+        # в историю попадает каждый запрос, даже если симуляция была общей
+        await asyncio.to_thread(save_result, word, trace.is_palindrome, len(trace.steps))
+        history_feed.notify()
+        return trace_response(request, trace)
 
     except Exception:
         traceback.print_exc()
@@ -87,25 +120,179 @@ async def check_word(request: Request):
         }, status_code=500)
 
 
+@app.get("/metrics")
+async def metrics():
+    """
+    Счётчики сервера: сколько проверок пришло, сколько реально посчитано
+    и сколько получили результат уже идущего вычисления.
+    При нескольких воркерах счётчики относятся к ответившему процессу (worker).
+    """
+    return JSONResponse({
+        "worker": os.getpid(),
+        "check": check_flight.stats(),
+        "cache": result_cache.stats(),
+        "sessions": len(sessions),
+    })
+
+
 @app.get("/history")
-async def history():
+async def history(since_id: int = None):
     """
-    Возвращает последние 20 проверок из базы данных.
+    Возвращает последние 20 проверок из базы данных (новые первыми).
+    ?since_id=N — только записи с id больше N, чтобы клиент дописывал новые строки.
     """
-    data = get_history(20)
+    data = await asyncio.to_thread(get_history, HISTORY_LIMIT, since_id)
     return JSONResponse(data)
 
 
+def sse_event(event: str, data, event_id: int = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append("data: " + json.dumps(data, ensure_ascii=False))
+    return "\n".join(lines) + "\n\n"
+
+
+async def history_events(request: Request, since_id: int = None):
+    """
+    События SSE: "rows" — новые записи (новые первыми), "clear" — история очищена.
+    Сначала отправляются записи после since_id, затем — по мере появления.
+    """
+    queue = await history_feed.subscribe()
+    try:
+        if since_id is not None:
+            rows = await asyncio.to_thread(get_history, HISTORY_LIMIT, since_id)
+            if rows:
+                yield sse_event("rows", rows, rows[0]["id"])
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(queue.get(), SSE_KEEPALIVE)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event["type"] == "rows":
+                yield sse_event("rows", event["rows"], event["rows"][0]["id"])
+            else:
+                yield sse_event("clear", {})
+    finally:
+        history_feed.unsubscribe(queue)
+
+
+@app.get("/history/stream")
+async def history_stream(request: Request, since_id: int = None):
+    """
+    Поток новых записей истории (Server-Sent Events).
+    При переподключении EventSource сам передаёт Last-Event-ID — id последней полученной записи.
+    """
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id and last_event_id.isdigit():
+        since_id = int(last_event_id)
+    return StreamingResponse(
+        history_events(request, since_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.delete("/history/clear")
 async def clear_history():
     """
     Очистка истории (удаляет все записи из таблицы history).
     """
-    import sqlite3
-    from tm.database import DB_PATH
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute("DELETE FROM history")
-    conn.commit()
-    conn.close()
+    await asyncio.to_thread(clear_history_db)
+    history_feed.notify()
     return JSONResponse({"message": "История очищена."})
+
+
+@app.websocket("/ws")
+async def session_socket(websocket: WebSocket):
+    """
+    Интерактивная пошаговая работа машины на сервере.
+    Команды клиента (JSON):
+      {"cmd": "load", "word": "..."}      — загрузить слово;
+      {"cmd": "step"}                      — один шаг;
+      {"cmd": "run", "n": 100, "delay": 0} — до n шагов (delay — пауза между шагами, сек);
+      {"cmd": "pause"}                     — остановить выполнение run;
+      {"cmd": "seek", "step": 10}          — перейти к шагу с номером;
+      {"cmd": "reset"}                     — вернуться к началу слова.
+    Сервер отвечает сообщениями session/snapshot/delta/halted/error.
+    Параметр ?session=<id> позволяет вернуться к своей сессии после переподключения
+    (неизвестный id — создаётся новая сессия со своим id).
+    """
+    await websocket.accept()
+    session = sessions.get_or_create(websocket.query_params.get("session"))
+    await websocket.send_json({"type": "session", "id": session.id})
+    await websocket.send_json(session.snapshot())
+    runner = None
+
+    async def report_if_halted():
+        if session.machine.is_halted() and not session.saved:
+            session.saved = True
+            result = session.result()
+            await asyncio.to_thread(save_result, session.word, result["is_palindrome"], result["steps"])
+            history_feed.notify()
+            await websocket.send_json(result)
+
+    async def run_steps(n: int, delay: float):
+        remaining = n
+        while remaining > 0 and not session.machine.is_halted():
+            deltas = session.run(1 if delay else min(remaining, RUN_CHUNK))
+            remaining -= len(deltas)
+            session.touch()
+            await websocket.send_json({"type": "delta", "steps": deltas})
+            await report_if_halted()
+            # даже без задержки отдаём управление, чтобы успеть принять pause
+            await asyncio.sleep(delay)
+
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+                cmd = message.get("cmd")
+            except (ValueError, AttributeError):
+                await websocket.send_json({"type": "error", "message": "Ожидается JSON-объект с полем cmd."})
+                continue
+            session.touch()
+
+            if runner is not None:
+                runner.cancel()
+                runner = None
+
+            if cmd == "load":
+                word = str(message.get("word", "")).strip()
+                if not word:
+                    await websocket.send_json({"type": "error", "message": "Введите слово для проверки!"})
+                    continue
+                await websocket.send_json(session.load(word))
+            elif not session.loaded:
+                await websocket.send_json({"type": "error", "message": "Сначала загрузите слово (cmd: load)."})
+            elif cmd == "step":
+                await websocket.send_json({"type": "delta", "steps": session.run(1)})
+                await report_if_halted()
+            elif cmd == "run":
+                try:
+                    n = max(0, int(message.get("n", RUN_CHUNK)))
+                    delay = max(0.0, float(message.get("delay", 0)))
+                except (TypeError, ValueError):
+                    await websocket.send_json({"type": "error", "message": "n и delay должны быть числами."})
+                    continue
+                runner = asyncio.create_task(run_steps(n, delay))
+            elif cmd == "pause":
+                await websocket.send_json(session.snapshot())
+            elif cmd == "seek":
+                try:
+                    step = max(0, int(message.get("step", 0)))
+                except (TypeError, ValueError):
+                    await websocket.send_json({"type": "error", "message": "step должен быть числом."})
+                    continue
+                await websocket.send_json(await asyncio.to_thread(session.seek, step))
+                await report_if_halted()
+            elif cmd == "reset":
+                await websocket.send_json(session.reset())
+            else:
+                await websocket.send_json({"type": "error", "message": f"Неизвестная команда: {cmd}"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if runner is not None:
+            runner.cancel()
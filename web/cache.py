@@ -0,0 +1,100 @@
+"""
+Кэш результатов /check, общий для всех воркеров веб-сервера.
+
+При запуске uvicorn/gunicorn с несколькими воркерами у каждого процесса своя
+память, поэтому кэш хранится в отдельном файле SQLite рядом с базой истории
+(режим WAL, ожидание блокировки вместо ошибки). Слово, посчитанное одним
+воркером, другие отдают без повторной симуляции.
+
+Вытеснение — по порядку добавления (самые старые записи), чтобы чтение
+не требовало записи в базу.
+
+Файл кэша переживает перезапуск сервера, поэтому в нём хранятся только
+простые данные (JSON), а ключ содержит FORMAT_VERSION: после изменения
+Trace или simulate версия увеличивается, и старые записи просто не находятся.
+"""
+import json
+import os
+import sqlite3
+
+from tm import database
+
+
+# Увеличивается при изменении формата хранимых данных (Trace.to_data) или симуляции
+FORMAT_VERSION = 2
+
+
+class ResultCache:
+    """
+    Ключ → данные, сериализуемые в JSON (для /check — Trace.to_data()).
+    path — путь к файлу кэша; по умолчанию TM_CACHE_PATH или <база истории>_cache.db.
+    """
+    def __init__(self, path: str = None, max_entries: int = 10_000, max_value_bytes: int = 64 * 1024):
+        self.path = path
+        self.max_entries = max_entries
+        # большие значения не кэшируются: размер файла не больше max_entries × max_value_bytes
+        self.max_value_bytes = max_value_bytes
+        self.hits = 0
+        self.misses = 0
+        self._initialized = set()
+
+    @property
+    def db_path(self) -> str:
+        if self.path:
+            return self.path
+        return os.environ.get("TM_CACHE_PATH") or os.path.splitext(database.DB_PATH)[0] + "_cache.db"
+
+    def _connect(self) -> sqlite3.Connection:
+        path = self.db_path
+        conn = database.connect(path)
+        if path not in self._initialized:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            conn.commit()
+            self._initialized.add(path)
+        return conn
+
+    @staticmethod
+    def make_key(table_name: str, word: str, max_steps: int) -> str:
+        return f"v{FORMAT_VERSION}\x00{table_name}\x00{max_steps}\x00{word}"
+
+    def get(self, key: str):
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value) -> bool:
+        """Сохраняет значение; False — значение больше max_value_bytes и не сохранено."""
+        data = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        if len(data.encode("utf-8")) > self.max_value_bytes:
+            return False
+        conn = self._connect()
+        try:
+            conn.execute("INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)", (key, data))
+            conn.execute(
+                "DELETE FROM cache WHERE rowid <= (SELECT MAX(rowid) FROM cache) - ?",
+                (self.max_entries,)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        return True
+
+    def clear(self):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM cache")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def stats(self) -> dict:
+        """Счётчики текущего процесса (у каждого воркера свои)."""
+        return {"hits": self.hits, "misses": self.misses}
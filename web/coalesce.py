@@ -0,0 +1,45 @@
+"""
+Объединение одновременных одинаковых запросов (single-flight).
+
+Если несколько запросов с одним ключом приходят, пока первый ещё считается,
+они не запускают вычисление заново, а ждут результат первого.
+"""
+import asyncio
+
+
+class SingleFlight:
+    """
+    Не более одного вычисления на ключ в каждый момент времени.
+    Счётчики: calls — всего вызовов, executed — запущено вычислений,
+    coalesced — вызовов, получивших чужой результат.
+    """
+    def __init__(self):
+        self.inflight = {}
+        self.calls = 0
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key, func):
+        """
+        func — функция без аргументов, возвращающая корутину.
+        Вычисление идёт в отдельной задаче: отмена одного из ожидающих
+        (например, клиент закрыл соединение) не отменяет его для остальных.
+        """
+        self.calls += 1
+        task = self.inflight.get(key)
+        if task is None:
+            self.executed += 1
+            task = asyncio.ensure_future(func())
+            self.inflight[key] = task
+            task.add_done_callback(lambda _: self.inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "inflight": len(self.inflight),
+        }
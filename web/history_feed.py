@@ -0,0 +1,90 @@
+"""
+Лента новых записей истории для SSE (/history/stream).
+
+Один опрос базы на воркер, сколько бы клиентов ни было подключено:
+фоновая задача раз в interval проверяет MIN(id) и MAX(id) и, если появились
+записи (их мог добавить любой воркер или процесс), читает только их и рассылает
+подписчикам. После записи в этом же воркере notify() будит опрос сразу.
+Очистка истории видна по смене MIN(id): MAX(id) после очистки может и вырасти,
+если до опроса успели добавить новые записи (id в history не переиспользуются).
+
+Модуль не зависит от FastAPI, чтобы логику можно было проверять отдельно.
+"""
+import asyncio
+
+from tm import database
+
+
+class HistoryFeed:
+    """
+    Подписчик получает asyncio.Queue, в которую приходят события:
+      {"type": "rows", "rows": [...]}  — новые записи (новые первыми);
+      {"type": "clear"}                — история очищена.
+    """
+    def __init__(self, interval: float = 1.0, limit: int = 20):
+        self.interval = interval
+        self.limit = limit
+        self.subscribers = set()
+        self.first_id = None
+        self.last_id = None
+        self._task = None
+        self._wake = None
+
+    async def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue()
+        if self._task is None or self._task.done():
+            # точка отсчёта фиксируется до возврата: всё, что запишут после подписки, придёт в очередь
+            # (в режиме WAL чтение не ждёт писателей)
+            bounds = await asyncio.to_thread(database.history_id_range)
+            # пока шло чтение, опрос мог запустить другой подписчик
+            if self._task is None or self._task.done():
+                self.first_id, self.last_id = bounds
+                self._wake = asyncio.Event()
+                self._task = asyncio.create_task(self._run())
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.subscribers.discard(queue)
+
+    def notify(self):
+        """Вызывается после записи в историю — опрос выполнится без ожидания interval."""
+        if self._wake is not None:
+            self._wake.set()
+
+    def poll(self) -> list:
+        """Один опрос базы (выполняется в отдельном потоке). Возвращает события для рассылки."""
+        first_id, last_id = database.history_id_range()
+        events = []
+        if self.first_id and first_id != self.first_id:
+            # пропала самая старая из известных записей — история очищалась
+            events.append({"type": "clear"})
+            self.last_id = 0  # все оставшиеся записи добавлены после очистки
+        self.first_id = first_id
+        if last_id > self.last_id:
+            rows = database.get_history(self.limit, since_id=self.last_id)
+            if rows:
+                # между двумя запросами могли появиться ещё записи — они уже в rows
+                self.last_id = max([last_id] + [row["id"] for row in rows])
+                events.append({"type": "rows", "rows": rows})
+        return events
+
+    async def _run(self):
+        # опрос идёт, только пока есть подписчики
+        while self.subscribers:
+            for event in await asyncio.to_thread(self.poll):
+                for queue in self.subscribers:
+                    queue.put_nowait(event)
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
@@ -0,0 +1,152 @@
+"""
+Интерактивные сессии машины Тьюринга для WebSocket-API.
+
+Каждый клиент держит на сервере живую машину и управляет ею командами
+(load/step/run/pause/seek/reset). Вместо полной трассы клиенту отправляются
+только изменения после каждого шага (дельты). Неактивные сессии удаляются
+по истечении TTL.
+
+Модуль не зависит от FastAPI, чтобы логику можно было проверять отдельно.
+"""
+import time
+import uuid
+
+from tm.transitions import get_table
+from tm.turing_machine import TuringMachine
+
+
+# Лимит шагов интерактивной сессии — намного больше, чем у /check
+SESSION_MAX_STEPS = 10_000_000
+
+
+class Session:
+    """Одна интерактивная машина и её входное слово."""
+    def __init__(self, session_id: str, table_name: str = "palindrome"):
+        self.id = session_id
+        self.machine = TuringMachine(get_table(table_name))
+        self.machine.max_steps = SESSION_MAX_STEPS
+        self.word = None
+        self.saved = False  # результат уже записан в историю
+        self.last_used = time.monotonic()
+
+    def touch(self):
+        self.last_used = time.monotonic()
+
+    @property
+    def loaded(self) -> bool:
+        return self.word is not None
+
+    def load(self, word: str) -> dict:
+        self.word = word
+        self.saved = False
+        self.machine.load_tape(word)
+        return self.snapshot()
+
+    def reset(self) -> dict:
+        if self.loaded:
+            self.machine.load_tape(self.word)
+            self.saved = False  # новый прогон снова сообщит результат
+        return self.snapshot()
+
+    def snapshot(self) -> dict:
+        """Полное состояние — отправляется после load/seek/reset."""
+        m = self.machine
+        return {
+            "type": "snapshot",
+            "tape": str(m.tape) if self.loaded else "",
+            "head": m.head,
+            "state": m.state,
+            "step": m.step_count,
+            "halted": m.is_halted(),
+        }
+
+    def step(self):
+        """
+        Один шаг машины. Возвращает дельту: сдвиг ленты влево (shift),
+        изменённую ячейку (write), новую длину ленты, головку и состояние.
+        """
+        m = self.machine
+        tape = m.tape
+        prev_head = m.head
+        prev_offset = tape.offset
+        action = m.step()
+        shift = tape.offset - prev_offset
+        pos = prev_head + shift
+        return {
+            "step": m.step_count,
+            "shift": shift,
+            "write": [pos, tape.read(pos)],
+            "length": len(tape),
+            "head": m.head,
+            "state": m.state,
+            "action": action,
+        }
+
+    def run(self, n: int) -> list:
+        """До n шагов (меньше, если машина остановилась)."""
+        deltas = []
+        for _ in range(n):
+            if self.machine.is_halted():
+                break
+            deltas.append(self.step())
+        return deltas
+
+    def seek(self, step: int) -> dict:
+        """
+        Переход к шагу с номером step: машина детерминирована, поэтому шаги переигрываются
+        через TuringMachine.advance. Перемотка может быть долгой — веб-сервер вызывает seek
+        в отдельном потоке.
+        """
+        if not self.loaded:
+            return self.snapshot()
+        m = self.machine
+        step = min(step, m.max_steps)
+        if step < m.step_count:
+            m.load_tape(self.word)
+            self.saved = False
+        m.advance(step - m.step_count)
+        return self.snapshot()
+
+    def result(self) -> dict:
+        m = self.machine
+        return {
+            "type": "halted",
+            "is_palindrome": m.state == m.accept_state,
+            "result": m.get_result(),
+            "steps": m.step_count,
+        }
+
+
+class SessionStore:
+    """
+    Сессии по идентификатору с вытеснением по TTL неактивности
+    и ограничением общего числа (вытесняется самая давно использованная).
+    """
+    def __init__(self, ttl: float = 600.0, max_sessions: int = 1000):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.sessions = {}
+
+    def get_or_create(self, session_id: str = None) -> Session:
+        """Существующая сессия с этим id или новая со случайным id."""
+        self.evict_expired()
+        session = self.sessions.get(session_id) if session_id else None
+        if session is None:
+            if len(self.sessions) >= self.max_sessions:
+                oldest = min(self.sessions.values(), key=lambda s: s.last_used)
+                del self.sessions[oldest.id]
+            # id выдаёт только сервер: неизвестный id клиента не становится именем новой сессии
+            session = Session(uuid.uuid4().hex)
+            self.sessions[session.id] = session
+        session.touch()
+        return session
+
+    def evict_expired(self, now: float = None) -> int:
+        now = time.monotonic() if now is None else now
+        expired = [sid for sid, s in self.sessions.items() if now - s.last_used > self.ttl]
+        for sid in expired:
+            del self.sessions[sid]
+        return len(expired)
+
+    def __len__(self):
+        return len(self.sessions)
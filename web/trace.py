@@ -0,0 +1,346 @@
+"""
+Пошаговая трасса работы машины для ответа /check.
+
+Вынесена из обработчика, чтобы её можно было считать в отдельном потоке
+и отдавать в разных форматах:
+  - JSON (по умолчанию) — список {"tape", "head", "state", "action"};
+  - компактный двоичный формат application/x-tm-trace.
+
+Двоичный формат не повторяет ленту и тексты действий на каждом шаге:
+сохраняются словари символов и состояний, входное слово и на каждый шаг
+только записанный символ, направление и новое состояние (индексы — varint).
+Ленту, положение головки и тексты действий клиент восстанавливает сам,
+повторяя шаги машины.
+"""
+import gzip
+import json
+
+try:
+    import brotli
+except ImportError:  # brotli — необязательная зависимость
+    brotli = None
+
+from tm.transitions import TransitionTable, get_table
+from tm.turing_machine import TuringMachine
+
+
+# Максимум шагов, которые /check отдаёт клиенту
+CHECK_MAX_STEPS = 500
+
+BINARY_MEDIA_TYPE = "application/x-tm-trace"
+MAGIC = b"TMT1"
+
+# Виды шагов в двоичном формате
+STEP_MOVE = 0         # обычный переход
+STEP_NO_TRANSITION = 1  # перехода нет — машина отклоняет слово
+STEP_TEXT = 2         # прочие сообщения машины, текст передаётся как есть
+DIRECTIONS = "LRS"
+DIRECTION_TEXT = {"L": "влево", "R": "вправо", "S": "остались"}
+
+# Меньшие ответы не сжимаются — выигрыш меньше накладных расходов
+MIN_COMPRESS_SIZE = 512
+
+
+def human_action(current_symbol: str, action_text: str) -> str:
+    """Понятное описание шага для веб-интерфейса."""
+    text = f"Машина считывает символ «{current_symbol}». {action_text}."
+    if "влево" in action_text:
+        text += " Головка движется влево."
+    elif "вправо" in action_text:
+        text += " Головка движется вправо."
+    elif "остались" in action_text:
+        text += " Головка остаётся на месте."
+    return text
+
+
+class Trace:
+    """
+    Результат симуляции: данные для обоих форматов ответа.
+    Закодированные представления кэшируются — объект общий
+    для объединённых одинаковых запросов.
+    """
+    def __init__(self, word, start_state, blank, steps, records, is_palindrome, result):
+        self.word = word
+        self.start_state = start_state
+        self.blank = blank
+        self.steps = steps
+        # (вид шага, записанный символ, направление, новое состояние, текст)
+        self.records = records
+        self.is_palindrome = is_palindrome
+        self.result = result
+        self._encoded = {}
+
+    def to_dict(self) -> dict:
+        return {
+            "is_palindrome": self.is_palindrome,
+            "result": self.result,
+            "steps": self.steps,
+        }
+
+    def to_data(self) -> dict:
+        """
+        Поля простыми типами — для хранения в общем кэше (JSON).
+        Шаги с копиями ленты не сохраняются: from_data восстанавливает их по записям.
+        """
+        return {
+            "word": self.word,
+            "start_state": self.start_state,
+            "blank": self.blank,
+            "records": self.records,
+            "is_palindrome": self.is_palindrome,
+            "result": self.result,
+        }
+
+    @classmethod
+    def from_data(cls, data: dict) -> "Trace":
+        """Обратное к to_data (в JSON кортежи записей становятся списками)."""
+        records = [tuple(record) for record in data["records"]]
+        return cls(
+            word=data["word"],
+            start_state=data["start_state"],
+            blank=data["blank"],
+            steps=replay_steps(data["word"], data["start_state"], data["blank"], records),
+            records=records,
+            is_palindrome=data["is_palindrome"],
+            result=data["result"],
+        )
+
+    def encoded(self, binary: bool = False, encoding: str = None) -> bytes:
+        """Тело ответа в нужном формате и со сжатием (gzip/br или None)."""
+        key = (binary, encoding)
+        body = self._encoded.get(key)
+        if body is None:
+            if encoding:
+                body = compress(self.encoded(binary), encoding)
+            elif binary:
+                body = encode_binary(self)
+            else:
+                body = json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            self._encoded[key] = body
+        return body
+
+
+def choose_encoding(accept_encoding: str, size: int):
+    """Выбирает сжатие по заголовку Accept-Encoding: br (если установлен brotli), затем gzip."""
+    if size < MIN_COMPRESS_SIZE:
+        return None
+    accepted = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip().lower())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    raise ValueError(f"Неизвестное сжатие: {encoding}")
+
+
+def simulate(word: str, table_name: str = "palindrome", max_steps: int = CHECK_MAX_STEPS,
+             table: TransitionTable = None) -> Trace:
+    """Запускает машину на слове и записывает трассу не более чем из max_steps шагов."""
+    # Таблица переходов строится один раз при первом запросе
+    machine = TuringMachine(table or get_table(table_name))
+    machine.load_tape(word)
+
+    steps = []
+    records = []
+    step_count = 0
+
+    while not machine.is_halted() and step_count < max_steps:
+        tape_str = "".join(machine.tape.cells)
+        current_symbol = machine.read_symbol()
+        prev_state = machine.state
+        prev_count = machine.step_count
+        trans = machine.transitions.get(prev_state, current_symbol, machine.register)
+
+        # Выполняем один шаг
+        action_text = machine.step()
+
+        if machine.step_count > prev_count:
+            write_sym, direction = trans[0], trans[1]
+            written = current_symbol if write_sym == "_any_" else write_sym
+            records.append((STEP_MOVE, written, direction, machine.state, None))
+        elif trans is None and machine.state == machine.reject_state:
+            records.append((STEP_NO_TRANSITION, None, "S", machine.state, None))
+        else:
+            records.append((STEP_TEXT, None, "S", machine.state, action_text))
+
+        steps.append({
+            "tape": tape_str,
+            "head": machine.head,
+            "state": machine.state,
+            "action": human_action(current_symbol, action_text)
+        })
+        step_count += 1
+
+    return Trace(
+        word=word,
+        start_state=machine.start_state,
+        blank=machine.blank,
+        steps=steps,
+        records=records,
+        is_palindrome=machine.state == machine.accept_state,
+        result=machine.get_result(),
+    )
+
+
+# ========================== ДВОИЧНЫЙ ФОРМАТ ==============================
+
+def _varint(value: int, out: bytearray):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def _string(text: str, out: bytearray):
+    data = text.encode("utf-8")
+    _varint(len(data), out)
+    out += data
+
+
+def encode_binary(trace: Trace) -> bytes:
+    """
+    Раскладка (все числа — беззнаковые varint, строки — длина + UTF-8):
+      "TMT1", флаги (бит 0 — палиндром), строка результата,
+      словарь символов, словарь состояний, словарь текстов,
+      индекс начального состояния, индекс пустого символа,
+      входное слово (длина + индексы символов),
+      число шагов и для каждого шага: байт (вид << 2 | направление),
+      [индекс записанного символа — для обычного шага], [индекс текста — для STEP_TEXT],
+      индекс нового состояния.
+    """
+    symbols, states, texts = {}, {}, {}
+
+    def index(table, value):
+        return table.setdefault(value, len(table))
+
+    index(symbols, trace.blank)
+    index(states, trace.start_state)
+    word = [index(symbols, ch) for ch in trace.word]
+    body = bytearray()
+    for kind, written, direction, state, text in trace.records:
+        body.append(kind << 2 | DIRECTIONS.index(direction))
+        if kind == STEP_MOVE:
+            _varint(index(symbols, written), body)
+        elif kind == STEP_TEXT:
+            _varint(index(texts, text), body)
+        _varint(index(states, state), body)
+
+    out = bytearray(MAGIC)
+    out.append(1 if trace.is_palindrome else 0)
+    _string(trace.result, out)
+    for table in (symbols, states, texts):
+        _varint(len(table), out)
+        for value in table:
+            _string(value, out)
+    _varint(states[trace.start_state], out)
+    _varint(symbols[trace.blank], out)
+    _varint(len(word), out)
+    for i in word:
+        _varint(i, out)
+    _varint(len(trace.records), out)
+    out += body
+    return bytes(out)
+
+
+def decode_binary(data: bytes) -> dict:
+    """
+    Обратное преобразование в словарь того же вида, что и JSON-ответ.
+    Повторяет логику декодера в web/templates/index.html.
+    """
+    if data[:4] != MAGIC:
+        raise ValueError("Неверный формат трассы")
+    pos = 4
+
+    def varint():
+        nonlocal pos
+        value = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                return value
+
+    def string():
+        nonlocal pos
+        length = varint()
+        text = data[pos:pos + length].decode("utf-8")
+        pos += length
+        return text
+
+    is_palindrome = bool(data[pos])
+    pos += 1
+    result = string()
+    symbols, states, texts = ([string() for _ in range(varint())] for _ in range(3))
+    start_state = states[varint()]
+    blank = symbols[varint()]
+    word = "".join(symbols[varint()] for _ in range(varint()))
+    records = []
+    for _ in range(varint()):
+        op = data[pos]
+        pos += 1
+        kind, direction = op >> 2, DIRECTIONS[op & 3]
+        written = text = None
+        if kind == STEP_MOVE:
+            written = symbols[varint()]
+        elif kind == STEP_TEXT:
+            text = texts[varint()]
+        records.append((kind, written, direction, states[varint()], text))
+    steps = replay_steps(word, start_state, blank, records)
+    return {"is_palindrome": is_palindrome, "result": result, "steps": steps}
+
+
+def replay_steps(word: str, start_state: str, blank: str, records: list) -> list:
+    """
+    Шаги JSON-ответа ({"tape", "head", "state", "action"}) по записям трассы:
+    лента, головка и тексты действий восстанавливаются повтором шагов.
+    """
+    tape = list(word) or [blank]
+    head = 0
+    count = 0
+    state = start_state
+    steps = []
+    for kind, written, direction, new_state, text in records:
+        tape_str = "".join(tape)
+        current = tape[head]
+        prev_state = state
+        state = new_state
+        if kind == STEP_MOVE:
+            tape[head] = written
+            if direction == "L":
+                if head == 0:
+                    tape.insert(0, blank)
+                else:
+                    head -= 1
+            elif direction == "R":
+                head += 1
+                if head >= len(tape):
+                    tape.append(blank)
+            count += 1
+            action = (
+                f"[{count}] Символ: '{current}' → Записали: '{written}', "
+                f"движение: {DIRECTION_TEXT[direction]}, состояние: {prev_state} → {state}"
+            )
+        elif kind == STEP_NO_TRANSITION:
+            action = f"Нет перехода для ({state}, {current}) — отклонено."
+        else:
+            action = text
+        steps.append({"tape": tape_str, "head": head, "state": state, "action": human_action(current, action)})
+    return steps